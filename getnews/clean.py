@@ -31,6 +31,9 @@ from config import (
     EXCLUDED_FROM_CLEAN,
 )
 
+# Start of a _meta header line, skipped without parsing it
+META_PREFIX = '{"_meta"'
+
 
 def generate_id(url: str) -> str:
     """Generate a unique ID from URL."""
@@ -38,20 +41,20 @@ def generate_id(url: str) -> str:
 
 
 def matches_keywords(story: dict, keywords: list[str]) -> bool:
-    """Check if story title or summary contains any keyword (loose match)."""
+    """Check if story title or summary contains any (lowercase) keyword (loose match)."""
     title = (story.get("title") or "").lower()
     summary = (story.get("summary") or "").lower()
     text = f"{title} {summary}"
 
     for kw in keywords:
-        if kw.lower() in text:
+        if kw in text:
             return True
     return False
 
 
 def matches_strict_keywords(story: dict, keywords: list[str]) -> bool:
     """
-    Strict matching for clean files:
+    Strict matching for clean files (keywords must be lowercase):
     - Keyword in title, OR
     - Keyword appears 2+ times in summary
     """
@@ -59,10 +62,9 @@ def matches_strict_keywords(story: dict, keywords: list[str]) -> bool:
     summary = (story.get("summary") or story.get("description") or "").lower()
 
     for kw in keywords:
-        kw_lower = kw.lower()
-        if kw_lower in title:
+        if kw in title:
             return True
-        if summary.count(kw_lower) >= 2:
+        if summary.count(kw) >= 2:
             return True
     return False
 
@@ -82,11 +84,16 @@ def is_english(story: dict) -> bool:
         return True  # Assume English on detection failure
 
 
+def get_topic_keywords(topic_name: str) -> list[str]:
+    """Lowercased keywords for one topic, so the matchers don't lower them per story."""
+    return [kw.lower() for kw in TOPICS[topic_name]["keywords"]]
+
+
 def get_all_keywords() -> list[str]:
-    """Collect all keywords from all topics."""
+    """Collect all keywords from all topics (lowercased)."""
     all_kw = set()
     for topic_config in TOPICS.values():
-        all_kw.update(topic_config["keywords"])
+        all_kw.update(kw.lower() for kw in topic_config["keywords"])
     return list(all_kw)
 
 
@@ -135,19 +142,7 @@ def load_jsonl(path: Path) -> list[dict]:
     """Load JSONL file, skipping _meta lines."""
     if not path.exists():
         return []
-
-    records = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            obj = json.loads(line)
-            if isinstance(obj, dict) and not obj.get("_meta"):
-                records.append(obj)
-        except json.JSONDecodeError:
-            continue
-    return records
+    return parse_jsonl_content(path.read_text(encoding="utf-8"))
 
 
 def save_jsonl(path: Path, records: list[dict], meta: dict | None = None) -> None:
@@ -201,7 +196,8 @@ def parse_jsonl_content(content: str) -> list[dict]:
     records = []
     for line in content.splitlines():
         line = line.strip()
-        if not line:
+        # save_jsonl writes the meta header with "_meta" as its first key
+        if not line or line.startswith(META_PREFIX):
             continue
         try:
             obj = json.loads(line)
@@ -285,7 +281,7 @@ def main() -> int:
             print(f"  Unknown topic: {topic_name}")
             continue
 
-        keywords = TOPICS[topic_name]["keywords"]
+        keywords = get_topic_keywords(topic_name)
 
         # Filter raw records for this topic (loose match first, then strict)
         # Also exclude domains in EXCLUDED_FROM_CLEAN and non-English content
@@ -338,7 +334,7 @@ def main() -> int:
     print(f"  Raw: +{len(new_records)} new → {len(all_raw)} total")
     for topic_name in topic_keys:
         if topic_name in TOPICS:
-            keywords = TOPICS[topic_name]["keywords"]
+            keywords = get_topic_keywords(topic_name)
             topic_raw = [r for r in all_raw if matches_keywords(r, keywords)]
             topic_clean = [r for r in topic_raw if matches_strict_keywords(r, keywords)]
             print(f"  {topic_name}: {len(topic_clean)} clean (from {len(topic_raw)} matching)")
@@ -3,11 +3,20 @@
 Check date ranges in gist data and find revisions with specific dates.
 """
 
+import bisect
 import json
+import re
 import subprocess
 from collections import Counter
 from urllib.request import urlopen
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
+
 UNIFIED_GIST_ID = "16c75a94d276d2800a44e3c2437f40e4"
 OWNER = "cstaal88"
 
@@ -16,6 +25,8 @@ OLD_GISTS = {
     "greenland-trump": "a046f4a9233ff2e499dfeb356e081d79",
 }
 
+PUBLISH_DATE_RE = re.compile(r'"publish_date":\s*"([^"]+)"')
+
 
 def fetch_gist_file(gist_id: str, filename: str, version: str = None) -> str | None:
     """Fetch file from gist, optionally at specific version."""
@@ -37,25 +48,17 @@ def get_all_versions(gist_id: str) -> list[dict]:
         capture_output=True, text=True
     )
     if result.returncode == 0:
-        return json.loads(result.stdout)
+        return json_loads(result.stdout)
     return []
 
 
 def analyze_dates(content: str) -> dict:
-    """Extract date stats from JSONL content."""
-    dates = []
-    for line in content.strip().split("\n"):
-        if not line.strip():
-            continue
-        try:
-            obj = json.loads(line)
-            if obj.get("_meta"):
-                continue
-            pd = obj.get("publish_date")
-            if pd:
-                dates.append(pd)
-        except:
-            pass
+    """Extract date stats from JSONL content.
+
+    Only publish_date is needed, so scan for it directly instead of
+    parsing every record (_meta lines carry no publish_date).
+    """
+    dates = PUBLISH_DATE_RE.findall(content)
 
     if not dates:
         return {"count": 0, "earliest": None, "latest": None}
@@ -90,23 +93,29 @@ def main():
         best_version = None
         best_latest_date = None
 
-        for v in versions:
+        # Only versions from Jan 26 or earlier Jan 27 are of interest. ISO
+        # timestamps sort lexicographically, so bisect out that window.
+        versions.sort(key=lambda v: v["committed_at"])
+        commit_dates = [v["committed_at"] for v in versions]
+        lo = bisect.bisect_left(commit_dates, "2026-01-26")
+        hi = bisect.bisect_left(commit_dates, "2026-01-27T18:00")
+
+        # Walk newest first, matching the order the API returns
+        for v in reversed(versions[lo:hi]):
             commit_date = v["committed_at"][:16]
             sha = v["version"]
 
-            # Check versions from Jan 26 or earlier Jan 27
-            if "2026-01-26" in commit_date or ("2026-01-27" in commit_date and commit_date < "2026-01-27T18:00"):
-                content = fetch_gist_file(gist_id, "raw.jsonl", sha)
-                if content:
-                    stats = analyze_dates(content)
-                    latest = stats['latest'] or "?"
-                    print(f"{commit_date:<20} {sha[:8]:<10} {stats['count']:<8} {stats['earliest']} to {latest}")
-
-                    if stats['latest'] and stats['latest'] >= "2026-01-26":
-                        found_jan26 = True
-                        if best_latest_date is None or stats['latest'] > best_latest_date:
-                            best_latest_date = stats['latest']
-                            best_version = sha
+            content = fetch_gist_file(gist_id, "raw.jsonl", sha)
+            if content:
+                stats = analyze_dates(content)
+                latest = stats['latest'] or "?"
+                print(f"{commit_date:<20} {sha[:8]:<10} {stats['count']:<8} {stats['earliest']} to {latest}")
+
+                if stats['latest'] and stats['latest'] >= "2026-01-26":
+                    found_jan26 = True
+                    if best_latest_date is None or stats['latest'] > best_latest_date:
+                        best_latest_date = stats['latest']
+                        best_version = sha
 
         if found_jan26:
             print(f"\n✓ Found Jan 26 data! Best version: {best_version[:8]} (data to {best_latest_date})")
@@ -5,17 +5,31 @@ Usage:
     python3 gists/gist-history.py                      # Show unified gist history
     python3 gists/gist-history.py --revision 3         # Show revision #3
     python3 gists/gist-history.py --revision 3 --file raw.jsonl --restore
+    python3 gists/gist-history.py --no-cache           # Skip the cached history
 """
 
 import argparse
+import copy
+import functools
 import json
 import subprocess
 import sys
 from datetime import datetime
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
+
 # Unified gist (primary)
 UNIFIED_GIST_ID = "16c75a94d276d2800a44e3c2437f40e4"
 
+# How long `gh api --cache` keeps the history response, so a listing and the
+# --revision run that follows it see the same numbering without a second fetch
+HISTORY_CACHE_TTL = "5m"
+
 # Old per-topic gists (archived, kept for reference)
 # OLD_GISTS = {
 #     "minneapolis-ice": "839f9f409d36d715d277095886ced536",
@@ -32,16 +46,24 @@ def run_gh(args: list[str]) -> str:
     return result.stdout
 
 
-def get_gist_history(gist_id: str, limit: int = 10) -> list[dict]:
-    """Get revision history for a gist."""
-    output = run_gh(["api", f"/gists/{gist_id}", "--jq", f".history[:{limit}]"])
-    return json.loads(output)
+@functools.lru_cache(maxsize=None)
+def _fetch_history(gist_id: str, use_cache: bool) -> tuple[dict, ...]:
+    """Full revision history (newest first), fetched once per process."""
+    args = ["api", f"/gists/{gist_id}", "--jq", ".history"]
+    if use_cache:
+        args += ["--cache", HISTORY_CACHE_TTL]
+    return tuple(json_loads(run_gh(args)))
+
+
+def get_gist_history(gist_id: str, limit: int = 10, use_cache: bool = True) -> list[dict]:
+    """Get revision history for a gist (callers get their own copies)."""
+    return copy.deepcopy(list(_fetch_history(gist_id, use_cache)[:limit]))
 
 
 def get_gist_revision(gist_id: str, version_sha: str) -> dict:
     """Get a specific revision of a gist."""
     output = run_gh(["api", f"/gists/{gist_id}/{version_sha}"])
-    return json.loads(output)
+    return json_loads(output)
 
 
 def format_timestamp(ts: str) -> str:
@@ -50,14 +72,14 @@ def format_timestamp(ts: str) -> str:
     return dt.strftime("%Y-%m-%d %H:%M UTC")
 
 
-def list_revisions(gist_id: str, limit: int = 10):
+def list_revisions(gist_id: str, limit: int = 10, use_cache: bool = True):
     """List recent revisions for the unified gist."""
     print(f"\n{'='*60}")
     print(f"UNIFIED GIST HISTORY")
     print(f"Gist ID: {gist_id}")
     print(f"{'='*60}\n")
 
-    history = get_gist_history(gist_id, limit)
+    history = get_gist_history(gist_id, limit, use_cache)
 
     print(f"{'#':<4} {'Date':<20} {'Changes':<15} {'SHA (first 8)'}")
     print("-" * 60)
@@ -73,10 +95,11 @@ def list_revisions(gist_id: str, limit: int = 10):
     print(f"To restore a file:  python3 gists/gist-history.py --revision N --file raw.jsonl --restore")
 
 
-def show_revision(gist_id: str, revision_num: int, filename: str = None, restore: bool = False):
+def show_revision(gist_id: str, revision_num: int, filename: str = None, restore: bool = False,
+                  use_cache: bool = True):
     """Show or restore a specific revision."""
     # Get the SHA for this revision number
-    history = get_gist_history(gist_id, revision_num + 1)
+    history = get_gist_history(gist_id, revision_num + 1, use_cache)
     if revision_num >= len(history):
         print(f"Revision {revision_num} not found. Max is {len(history) - 1}")
         sys.exit(1)
@@ -142,13 +165,14 @@ def main():
     parser.add_argument("--file", "-f", help="File to view/restore (raw.jsonl, clean-*.jsonl)")
     parser.add_argument("--restore", action="store_true", help="Restore file from revision")
     parser.add_argument("--limit", "-n", type=int, default=10, help="Number of revisions to show")
+    parser.add_argument("--no-cache", action="store_true", help="Fetch fresh history instead of gh's cached response")
 
     args = parser.parse_args()
 
     if args.revision is not None:
-        show_revision(UNIFIED_GIST_ID, args.revision, args.file, args.restore)
+        show_revision(UNIFIED_GIST_ID, args.revision, args.file, args.restore, use_cache=not args.no_cache)
     else:
-        list_revisions(UNIFIED_GIST_ID, args.limit)
+        list_revisions(UNIFIED_GIST_ID, args.limit, use_cache=not args.no_cache)
 
 
 if __name__ == "__main__":
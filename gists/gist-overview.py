@@ -8,16 +8,29 @@ Fetches and analyzes the raw.jsonl and clean-*.jsonl files from the unified gist
 providing stats, samples, and evaluation of cleaning procedures.
 """
 
+import hashlib
 import json
 import os
 import sys
+import threading
 from collections import Counter
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlparse
 
 import requests
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# orjson is optional; fall back to the stdlib parser when it's missing
+json_loads = orjson.loads if orjson else json.loads
+
 # Unified gist (primary)
 UNIFIED_GIST_ID = "16c75a94d276d2800a44e3c2437f40e4"
 
@@ -30,57 +43,131 @@ TOPICS = ["minneapolis-ice", "greenland-trump"]
 #     "greenland-trump": "a046f4a9233ff2e499dfeb356e081d79",
 # }
 
+# Local cache of API responses (revalidated by ETag) and raw file downloads
+CACHE_DIR = Path.home() / '.cache' / 'mina-gists'
 
-def get_gist_files(gist_id: str) -> dict[str, str]:
-    """Fetch all files from a gist. Returns {filename: content}."""
-    token = os.getenv('GITHUB_TOKEN') or os.getenv('GIST_PAT')
-    headers = {'Authorization': f'token {token}'} if token else {}
+META_PREFIX = b'{"_meta"'
 
-    url = f'https://api.github.com/gists/{gist_id}'
-    response = requests.get(url, headers=headers)
+# One session for the API call and all raw_url downloads: keep-alive
+# connections are reused and the auth header is set once
+SESSION = requests.Session()
+_token = os.getenv('GITHUB_TOKEN') or os.getenv('GIST_PAT')
+if _token:
+    SESSION.headers['Authorization'] = f'token {_token}'
+
+
+def cache_path(url: str, suffix: str) -> Path:
+    """Cache file for a URL."""
+    return CACHE_DIR / (hashlib.sha1(url.encode()).hexdigest() + suffix)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file in the same directory so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def fetch_raw_lines(raw_url: str) -> list[bytes] | None:
+    """Stream a gist file from its raw_url line by line."""
+    # raw_url embeds the file revision, so a cached copy never goes stale
+    cached = cache_path(raw_url, '.jsonl')
+    if cached.exists():
+        return cached.read_bytes().splitlines()
 
-    if response.status_code != 200:
+    # Stream rather than decoding the whole body into one string
+    with SESSION.get(raw_url, stream=True) as raw_response:
+        if raw_response.status_code != 200:
+            return None
+        lines = list(raw_response.iter_lines(chunk_size=1 << 16))
+
+    _write_atomic(cached, b'\n'.join(lines) + b'\n')
+    return lines
+
+
+def get_gist_files(gist_id: str) -> dict[str, list[bytes]]:
+    """Fetch all files from a gist. Returns {filename: lines}."""
+    url = f'https://api.github.com/gists/{gist_id}'
+    cached_body = cache_path(url, '.json')
+    cached_validators = cache_path(url, '.validators.json')
+
+    # Revalidate the cached response; GitHub answers 304 with no body if unchanged
+    request_headers = {'Accept': 'application/vnd.github+json'}
+    if cached_body.exists() and cached_validators.exists():
+        validators = json_loads(cached_validators.read_bytes())
+        if validators.get('etag'):
+            request_headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            request_headers['If-Modified-Since'] = validators['last_modified']
+
+    response = SESSION.get(url, headers=request_headers)
+
+    if response.status_code == 304:
+        gist_data = json_loads(cached_body.read_bytes())
+    elif response.status_code == 200:
+        gist_data = response.json()
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        if any(validators.values()):
+            # Body first: validators without a matching body would turn a 304 into a stale read
+            _write_atomic(cached_body, response.content)
+            _write_atomic(cached_validators, json.dumps(validators).encode())
+    else:
         print(f"Error fetching gist {gist_id}: {response.status_code}")
         return {}
 
-    gist_data = response.json()
     files = {}
+    truncated = {}
 
     for filename, file_info in gist_data.get('files', {}).items():
         # If file is truncated (>1MB), fetch from raw_url instead
         if file_info.get('truncated', False):
             raw_url = file_info.get('raw_url')
             if raw_url:
-                raw_response = requests.get(raw_url, headers=headers)
-                if raw_response.status_code == 200:
-                    files[filename] = raw_response.text
+                truncated[filename] = raw_url
         else:
-            files[filename] = file_info.get('content', '')
+            files[filename] = file_info.get('content', '').encode('utf-8').splitlines()
+
+    # Large files (raw.jsonl and each topic's clean file) download concurrently
+    if truncated:
+        with ThreadPoolExecutor(max_workers=len(truncated)) as pool:
+            futures = {
+                filename: pool.submit(fetch_raw_lines, raw_url)
+                for filename, raw_url in truncated.items()
+            }
+        for filename, future in futures.items():
+            lines = future.result()
+            if lines is not None:
+                files[filename] = lines
 
     return files
 
 
-def parse_jsonl(content: str) -> list[dict]:
-    """Parse JSONL content, skip meta lines."""
+def parse_jsonl(lines: list[bytes]) -> list[dict]:
+    """Parse JSONL lines, skip meta lines."""
     entries = []
-    for line in content.split('\n'):
-        line = line.strip()
-        if line:
+    for line in lines:
+        # Records start with '{' (no strip needed: lines come from splitlines/iter_lines);
+        # meta headers are written with _meta as the first key, skip them unparsed
+        if line.startswith(b'{') and not line.startswith(META_PREFIX):
             try:
-                entry = json.loads(line)
+                entry = json_loads(line)
                 if not entry.get('_meta'):
                     entries.append(entry)
-            except json.JSONDecodeError:
+            except ValueError:
                 continue
     return entries
 
 
+@lru_cache(maxsize=8192)
 def extract_domain(url: str) -> str:
     """Extract domain from URL."""
     if not url:
         return 'unknown'
     try:
-        from urllib.parse import urlparse
         parsed = urlparse(url)
         return parsed.netloc.replace('www.', '') or 'unknown'
     except Exception:
@@ -90,43 +177,45 @@ def extract_domain(url: str) -> str:
 def analyze_entries(entries: list[dict], is_raw: bool = False) -> dict:
     """Analyze a list of entries and return stats."""
     if not entries:
-        return {'count': 0, 'date_range': {}, 'date_counts': {}, 'media_stats': []}
-
-    dates = [e.get('publish_date', 'unknown') for e in entries]
-    media = [e.get('media_url') or extract_domain(e.get('url', '')) for e in entries]
+        return {'count': 0, 'date_range': {}, 'date_counts': {}, 'media_stats': [], 'sample': None}
 
-    date_counts = Counter(dates)
-    media_counts = Counter(media)
-
-    # Compute per-media summary lengths
+    # Single pass: count dates, collect per-media summary lengths (one per story,
+    # so each list's length is that outlet's story count)
+    date_counts = Counter()
     media_word_lengths: dict[str, list[int]] = defaultdict(list)
     for e in entries:
+        date_counts[e.get('publish_date', 'unknown')] += 1
         m = e.get('media_url') or extract_domain(e.get('url', ''))
         desc = e.get('description') or ''
         media_word_lengths[m].append(len(desc.split()) if desc else 0)
 
-    media_stats = []
-    for m, cnt in media_counts.items():
-        lengths = media_word_lengths.get(m, [])
-        mean_words = sum(lengths) / len(lengths) if lengths else 0
-        media_stats.append((m, cnt, mean_words))
+    media_stats = [
+        (m, len(lengths), sum(lengths) / len(lengths))
+        for m, lengths in media_word_lengths.items()
+    ]
     media_stats.sort(key=lambda x: -x[1])
 
-    valid_dates = sorted([d for d in date_counts.keys() if d and d != 'unknown'])
+    # ISO dates order lexicographically, so min/max give the range without sorting
+    valid_dates = [d for d in date_counts if d and d != 'unknown']
     date_range = {
-        'earliest': valid_dates[0] if valid_dates else None,
-        'latest': valid_dates[-1] if valid_dates else None,
+        'earliest': min(valid_dates, default=None),
+        'latest': max(valid_dates, default=None),
     }
 
     return {
         'count': len(entries),
         'date_range': date_range,
-        'date_counts': dict(date_counts),
+        'date_counts': date_counts,
         'media_stats': media_stats,
-        'samples': entries[:2],
+        'sample': entries[0],
     }
 
 
+def load_stats(lines: list[bytes], is_raw: bool = False) -> dict:
+    """Parse and analyze one gist file."""
+    return analyze_entries(parse_jsonl(lines), is_raw=is_raw)
+
+
 def print_histogram(title: str, counts: dict, bar_width: int = 40):
     """Print ASCII histogram."""
     sorted_keys = sorted([k for k in counts.keys() if k and k != 'unknown'])
@@ -134,12 +223,14 @@ def print_histogram(title: str, counts: dict, bar_width: int = 40):
         return
 
     max_count = max(counts[k] for k in sorted_keys)
-    print(f"\n  {title}:")
+    # Padded bar for every possible length, indexed per row
+    bars = [('█' * max(1, n)).ljust(bar_width) for n in range(bar_width + 1)]
+    lines = [f"\n  {title}:"]
     for k in sorted_keys:
         c = counts[k]
         length = int((c / max_count) * bar_width) if max_count > 0 else 0
-        bar = '█' * max(1, length)
-        print(f"    {k} | {bar:<{bar_width}} {c}")
+        lines.append(f"    {k} | {bars[length]} {c}")
+    print('\n'.join(lines))
 
 
 def print_media_stats(media_stats: list, bar_width: int = 30):
@@ -148,11 +239,13 @@ def print_media_stats(media_stats: list, bar_width: int = 30):
         return
 
     max_cnt = max(c for _, c, _ in media_stats)
-    print("\n  Stories per outlet:")
+    # Padded bar for every possible length, indexed per row
+    bars = [('█' * max(1, n)).ljust(bar_width) for n in range(bar_width + 1)]
+    lines = ["\n  Stories per outlet:"]
     for m, c, _ in media_stats:
         length = int((c / max_cnt) * bar_width) if max_cnt > 0 else 0
-        bar = '█' * max(1, length)
-        print(f"    {m:25} | {bar:<{bar_width}} {c}")
+        lines.append(f"    {m:25} | {bars[length]} {c}")
+    print('\n'.join(lines))
 
 
 def main():
@@ -170,14 +263,22 @@ def main():
 
     print(f"\nFiles in gist: {', '.join(sorted(files.keys()))}")
 
+    # Parse and analyze raw + each clean file in parallel worker processes;
+    # only the small stats dicts come back, not the parsed entries
+    clean_files = {topic: f"clean-{topic}.jsonl" for topic in TOPICS}
+    jobs = {'raw.jsonl': True} if 'raw.jsonl' in files else {}
+    jobs.update({fn: False for fn in clean_files.values() if fn in files})
+    with ProcessPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+        futures = {fn: pool.submit(load_stats, files[fn], is_raw) for fn, is_raw in jobs.items()}
+        all_stats = {fn: future.result() for fn, future in futures.items()}
+
     # Analyze raw.jsonl
-    if 'raw.jsonl' in files:
+    if 'raw.jsonl' in all_stats:
         print(f"\n{'='*60}")
         print("RAW DATA (all topics combined)")
         print("=" * 60)
 
-        raw_entries = parse_jsonl(files['raw.jsonl'])
-        stats = analyze_entries(raw_entries, is_raw=True)
+        stats = all_stats['raw.jsonl']
 
         print(f"\n  Total entries: {stats['count']}")
         if stats['date_range'].get('earliest'):
@@ -187,15 +288,13 @@ def main():
         print_media_stats(stats['media_stats'])
 
     # Analyze each clean file
-    for topic in TOPICS:
-        filename = f"clean-{topic}.jsonl"
-        if filename in files:
+    for topic, filename in clean_files.items():
+        if filename in all_stats:
             print(f"\n{'='*60}")
             print(f"CLEAN DATA: {topic}")
             print("=" * 60)
 
-            entries = parse_jsonl(files[filename])
-            stats = analyze_entries(entries)
+            stats = all_stats[filename]
 
             print(f"\n  Total entries: {stats['count']}")
             if stats['date_range'].get('earliest'):
@@ -205,12 +304,14 @@ def main():
             print_media_stats(stats['media_stats'])
 
             # Sample
-            if stats['samples']:
+            s = stats['sample']
+            if s:
+                title = s.get('title') or 'N/A'
+                url = s.get('url') or 'N/A'
                 print(f"\n  Sample record:")
-                s = stats['samples'][0]
-                print(f"    Title: {s.get('title', 'N/A')[:70]}...")
+                print(f"    Title: {title[:70]}...")
                 print(f"    Date: {s.get('publish_date', 'N/A')}")
-                print(f"    URL: {s.get('url', 'N/A')[:60]}...")
+                print(f"    URL: {url[:60]}...")
 
     print("\n" + "=" * 80)
     print(f"View gist: https://gist.github.com/{UNIFIED_GIST_ID}")
@@ -3,64 +3,121 @@
 Investigate gist history to find when data was lost.
 """
 
-import subprocess
+import functools
 import json
+import os
 import sys
-from urllib.request import urlopen
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
 
 GISTS = {
     "minneapolis-ice": "839f9f409d36d715d277095886ced536",
     "greenland-trump": "a046f4a9233ff2e499dfeb356e081d79",
 }
 
+# Downloaded revisions; /raw/<version>/ content never changes, so no revalidation
+CACHE_DIR = Path.home() / ".cache" / "mina-gists"
+
+# Concurrent revision downloads
+MAX_WORKERS = 8
+
+# One keep-alive connection pool for all raw downloads (shared by worker threads)
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "mina-pipeline"})
+
+META_PREFIXES = ('{"_meta"', '{"_manifest"')
+
+GITHUB_API = "https://api.github.com"
+
+def gh_api(path: str) -> requests.Response:
+    """GET a GitHub API path, authenticated with the same token gh uses."""
+    token = os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN") or os.getenv("GIST_PAT")
+    headers = {"Accept": "application/vnd.github+json"}
+    if token:
+        headers["Authorization"] = f"token {token}"
+    return SESSION.get(f"{GITHUB_API}/{path}", headers=headers, timeout=30)
+
 def get_commits(gist_id: str) -> list[dict]:
     """Get all commits for a gist."""
-    result = subprocess.run(
-        ["gh", "api", f"gists/{gist_id}/commits", "--paginate"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        print(f"Error getting commits: {result.stderr}")
-        return []
-    return json.loads(result.stdout)
+    commits = []
+    path = f"gists/{gist_id}/commits?per_page=100"
+    while path:
+        resp = gh_api(path)
+        if resp.status_code != 200:
+            print(f"Error getting commits: {resp.status_code} {resp.text}")
+            return []
+        commits.extend(json_loads(resp.content))
+        # Follow the Link: rel="next" header to the next page
+        next_url = resp.links.get("next", {}).get("url")
+        path = next_url.removeprefix(f"{GITHUB_API}/") if next_url else None
+    return commits
+
+@functools.lru_cache(maxsize=None)
+def get_owner(gist_id: str) -> str | None:
+    """Look up the gist owner's login (needed for raw URLs)."""
+    resp = gh_api(f"gists/{gist_id}")
+    if resp.status_code != 200:
+        return None
+    return json_loads(resp.content).get("owner", {}).get("login", "")
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file in the same directory so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
 def get_file_content(gist_id: str, version: str, filename: str) -> str | None:
     """Fetch file content for a specific version."""
-    # Find the owner from gh api
-    result = subprocess.run(
-        ["gh", "api", f"gists/{gist_id}"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
+    cached = CACHE_DIR / gist_id / version / filename
+    if cached.exists():
+        return cached.read_text(encoding="utf-8")
+
+    owner = get_owner(gist_id)
+    if owner is None:
         return None
-    data = json.loads(result.stdout)
-    owner = data.get("owner", {}).get("login", "")
 
     url = f"https://gist.githubusercontent.com/{owner}/{gist_id}/raw/{version}/{filename}"
     try:
-        with urlopen(url, timeout=10) as resp:
-            return resp.read().decode("utf-8")
+        resp = SESSION.get(url, timeout=10)
+        resp.raise_for_status()
+        content = resp.content.decode("utf-8")
     except Exception as e:
         return None
 
+    _write_atomic(cached, resp.content)
+    return content
+
 def count_records(content: str) -> int:
     """Count non-meta records in JSONL content."""
     if not content:
         return 0
     count = 0
-    for line in content.strip().split("\n"):
-        if not line.strip():
+    for line in content.splitlines():
+        if not line.startswith("{") or line.startswith(META_PREFIXES):
             continue
         try:
-            obj = json.loads(line)
+            obj = json_loads(line)
             if isinstance(obj, dict) and not obj.get("_meta") and not obj.get("_manifest"):
                 count += 1
         except:
             pass
     return count
 
+def count_revision(gist_id: str, version: str, filename: str) -> int:
+    """Count non-meta records in a file at a specific version."""
+    return count_records(get_file_content(gist_id, version, filename))
+
 def main():
     print("=" * 70)
     print("GIST HISTORY INVESTIGATION")
@@ -89,7 +146,7 @@ def main():
         else:
             sample_indices.extend(range(1, len(commits)))
 
-        sample_indices = sorted(set(sample_indices))
+        sample_indices = sorted(idx for idx in set(sample_indices) if idx < len(commits))
 
         print(f"{'#':<5} {'Date':<22} {'raw.jsonl':<12} {'clean.jsonl':<12}")
         print("-" * 55)
@@ -98,46 +155,55 @@ def main():
         max_raw_date = ""
         max_raw_idx = 0
 
-        for idx in sample_indices:
-            if idx >= len(commits):
-                continue
-            commit = commits[idx]
-            date = commit["committed_at"][:19].replace("T", " ")
-            version = commit["version"]
-
-            raw_content = get_file_content(gist_id, version, "raw.jsonl")
-            clean_content = get_file_content(gist_id, version, "clean.jsonl")
-
-            raw_count = count_records(raw_content)
-            clean_count = count_records(clean_content)
-
-            if raw_count > max_raw:
-                max_raw = raw_count
-                max_raw_date = date
-                max_raw_idx = idx
-
-            print(f"{idx:<5} {date:<22} {raw_count:<12} {clean_count:<12}")
-
-        print()
-        print(f"Max raw.jsonl records seen: {max_raw} (at revision #{max_raw_idx}, {max_raw_date})")
-
-        # If current is much less than max, find when it dropped
-        current_count = count_records(get_file_content(gist_id, commits[0]["version"], "raw.jsonl"))
-        if max_raw > current_count * 2:
-            print(f"\n⚠️  DATA LOSS DETECTED: Had {max_raw} records, now only {current_count}")
-            print("   Scanning to find when data was lost...")
-
-            # Binary search for when the drop happened
-            for i in range(len(commits)):
-                commit = commits[i]
-                version = commit["version"]
-                content = get_file_content(gist_id, version, "raw.jsonl")
-                count = count_records(content)
-                if count > current_count * 1.5:  # Found a version with more data
-                    date = commit["committed_at"][:19].replace("T", " ")
-                    print(f"   → Revision #{i} ({date}) had {count} records")
-                    print(f"   → Version SHA: {version}")
-                    break
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            # Download every sampled revision's files at once, print in order
+            futures = [
+                (
+                    idx,
+                    pool.submit(count_revision, gist_id, commits[idx]["version"], "raw.jsonl"),
+                    pool.submit(count_revision, gist_id, commits[idx]["version"], "clean.jsonl"),
+                )
+                for idx in sample_indices
+            ]
+
+            for idx, raw_future, clean_future in futures:
+                date = commits[idx]["committed_at"][:19].replace("T", " ")
+                raw_count = raw_future.result()
+                clean_count = clean_future.result()
+
+                if raw_count > max_raw:
+                    max_raw = raw_count
+                    max_raw_date = date
+                    max_raw_idx = idx
+
+                print(f"{idx:<5} {date:<22} {raw_count:<12} {clean_count:<12}")
+
+            print()
+            print(f"Max raw.jsonl records seen: {max_raw} (at revision #{max_raw_idx}, {max_raw_date})")
+
+            # If current is much less than max, find when it dropped
+            current_count = count_revision(gist_id, commits[0]["version"], "raw.jsonl")
+            if max_raw > current_count * 2:
+                print(f"\n⚠️  DATA LOSS DETECTED: Had {max_raw} records, now only {current_count}")
+                print("   Scanning to find when data was lost...")
+
+                # Scan in batches of MAX_WORKERS revisions, stopping at the first hit
+                found = False
+                for start in range(0, len(commits), MAX_WORKERS):
+                    batch = commits[start:start + MAX_WORKERS]
+                    counts = pool.map(
+                        lambda commit: count_revision(gist_id, commit["version"], "raw.jsonl"),
+                        batch,
+                    )
+                    for i, (commit, count) in enumerate(zip(batch, counts), start):
+                        if count > current_count * 1.5:  # Found a version with more data
+                            date = commit["committed_at"][:19].replace("T", " ")
+                            print(f"   → Revision #{i} ({date}) had {count} records")
+                            print(f"   → Version SHA: {commit['version']}")
+                            found = True
+                            break
+                    if found:
+                        break
 
     print("\n" + "=" * 70)
     print("To restore data from a specific revision:")
@@ -6,9 +6,21 @@ Recover Jan 27 data from old gist revisions and merge into unified gist.
 import json
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from urllib.request import urlopen
+from urllib.parse import urlparse
+
+import requests
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
 
 UNIFIED_GIST_ID = "16c75a94d276d2800a44e3c2437f40e4"
 OWNER = "cstaal88"
@@ -22,11 +34,22 @@ RECOVER_FROM = {
     # Add greenland-trump if it has recoverable data
 }
 
+# Reuse one connection to gist.githubusercontent.com across downloads
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "mina-pipeline"})
+
+# Header lines start with their marker key, so they can be skipped without parsing
+META_PREFIXES = ('{"_meta"', '{"_manifest"')
+
+# Records joined into each write() when saving JSONL
+WRITE_BATCH = 10_000
+
 
 def fetch_url(url: str) -> str | None:
     try:
-        with urlopen(url, timeout=30) as resp:
-            return resp.read().decode("utf-8")
+        resp = SESSION.get(url, timeout=30)
+        resp.raise_for_status()
+        return resp.content.decode("utf-8")
     except Exception as e:
         print(f"  Error: {e}")
         return None
@@ -40,35 +63,56 @@ def fetch_gist_file(gist_id: str, filename: str, version: str = None) -> str | N
     return fetch_url(url)
 
 
+TRACKING_PARAMS = ("utm_", "fbclid=", "gclid=")
+
+
+@lru_cache(maxsize=100_000)
+def canonical_url(url: str) -> str:
+    """Dedupe key for a URL: ignores scheme, www., trailing slash and tracking params."""
+    p = urlparse(url)
+    host = p.netloc.lower().removeprefix("www.")
+    query = "&".join(kv for kv in p.query.split("&") if kv and not kv.startswith(TRACKING_PARAMS))
+    return f"{host}{p.path.rstrip('/')}?{query}"
+
+
 def parse_jsonl(content: str) -> list[dict]:
     records = []
-    for line in content.strip().split("\n"):
-        if not line.strip():
+    for line in content.splitlines():
+        if not line.startswith("{") or line.startswith(META_PREFIXES):
             continue
         try:
-            obj = json.loads(line)
-            if not obj.get("_meta") and not obj.get("_manifest"):
-                records.append(obj)
-        except:
-            pass
+            obj = json_loads(line)
+        except ValueError:
+            continue
+        if isinstance(obj, dict) and not obj.get("_meta") and not obj.get("_manifest"):
+            records.append(obj)
     return records
 
 
+def dumps_line(obj: dict) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    # Same compact separators as orjson, so output bytes do not depend on whether it is installed
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
 def save_jsonl(path: Path, records: list[dict], meta: dict = None):
     path.parent.mkdir(parents=True, exist_ok=True)
-    lines = []
-    if meta:
-        lines.append(json.dumps(meta, ensure_ascii=False))
-    for r in records:
-        lines.append(json.dumps(r, ensure_ascii=False))
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # One write() per WRITE_BATCH lines, without joining the whole file in memory
+    with path.open("wb") as f:
+        if meta:
+            f.write(dumps_line(meta))
+        for i in range(0, len(records), WRITE_BATCH):
+            f.write(b"".join(map(dumps_line, records[i:i + WRITE_BATCH])))
 
 
 def gist_upload(gist_id: str, filename: str, filepath: Path) -> bool:
     result = subprocess.run(
         ["gh", "gist", "edit", gist_id, "-f", filename, str(filepath)],
-        capture_output=True, text=True, timeout=120
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=120
     )
+    if result.returncode != 0:
+        print(f"  gh gist edit failed: {result.stderr.strip()}", file=sys.stderr)
     return result.returncode == 0
 
 
@@ -80,9 +124,18 @@ def main():
     out_dir = Path("data/jan27-recovery")
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    # Start every download at once; the steps below consume them in order
+    pool = ThreadPoolExecutor(max_workers=1 + len(RECOVER_FROM))
+    current_future = pool.submit(fetch_gist_file, UNIFIED_GIST_ID, "raw.jsonl")
+    recovery_futures = {
+        topic: pool.submit(fetch_gist_file, info["gist_id"], "raw.jsonl", info["version"])
+        for topic, info in RECOVER_FROM.items()
+    }
+    pool.shutdown(wait=False)
+
     # Step 1: Download current unified gist
     print("\n1. Downloading current unified gist raw.jsonl...")
-    current_content = fetch_gist_file(UNIFIED_GIST_ID, "raw.jsonl")
+    current_content = current_future.result()
     if not current_content:
         print("   ERROR: Could not download current data")
         return 1
@@ -103,9 +156,9 @@ def main():
     print("\n2. Downloading Jan 27 data from old gist revisions...")
     recovered_records = []
 
-    for topic, info in RECOVER_FROM.items():
+    for topic, future in recovery_futures.items():
         print(f"\n   {topic}:")
-        content = fetch_gist_file(info["gist_id"], "raw.jsonl", info["version"])
+        content = future.result()
         if content:
             records = parse_jsonl(content)
             dates = sorted(set(r.get("publish_date") for r in records if r.get("publish_date")))
@@ -122,17 +175,19 @@ def main():
 
     # Step 3: Merge and dedupe
     print("\n3. Merging and deduping...")
-    all_records = current_records + recovered_records
-
-    seen_urls = set()
-    unique_records = []
-    for r in all_records:
+    # First occurrence of each URL wins; current records take precedence
+    by_url = {}
+    for r in chain(current_records, recovered_records):
         url = r.get("url")
-        if url and url not in seen_urls:
-            seen_urls.add(url)
-            unique_records.append(r)
+        if not url:
+            continue
+        key = canonical_url(url)
+        if key not in by_url:
+            by_url[key] = r
+    unique_records = list(by_url.values())
 
-    print(f"   Before merge: {len(current_records)} + {len(recovered_records)} = {len(all_records)}")
+    total = len(current_records) + len(recovered_records)
+    print(f"   Before merge: {len(current_records)} + {len(recovered_records)} = {total}")
     print(f"   After dedupe: {len(unique_records)}")
 
     new_count = len(unique_records) - len(current_records)
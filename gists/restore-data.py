@@ -4,12 +4,22 @@ Restore lost data from gist history and upload to unified gist.
 """
 
 import json
+import logging
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from urllib.request import urlopen
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
+
 # Good versions (before data loss at 18:15 on Jan 27)
 RESTORE_FROM = {
     "minneapolis-ice": {
@@ -26,49 +36,91 @@ RESTORE_FROM = {
 NEW_GIST_ID = "16c75a94d276d2800a44e3c2437f40e4"
 OWNER = "cstaal88"
 
-def fetch_gist_file(gist_id: str, version: str, filename: str) -> str | None:
-    """Fetch file from specific gist version."""
+# Records joined into each write() when saving JSONL
+WRITE_BATCH = 10_000
+
+log = logging.getLogger(__name__)
+
+def fetch_gist_file(gist_id: str, version: str, filename: str, dest: Path) -> bool:
+    """Download file from specific gist version straight to dest."""
     url = f"https://gist.githubusercontent.com/{OWNER}/{gist_id}/raw/{version}/{filename}"
-    print(f"  Fetching: {url[:80]}...")
+    log.debug("fetching %s", url)
+    # Stream into a .part file so a failed download never clobbers an earlier copy
+    part = dest.with_name(dest.name + ".part")
     try:
-        with urlopen(url, timeout=30) as resp:
-            return resp.read().decode("utf-8")
+        with urlopen(url, timeout=30) as resp, part.open("wb") as f:
+            shutil.copyfileobj(resp, f, 1 << 20)
     except Exception as e:
         print(f"  Error: {e}")
-        return None
+        part.unlink(missing_ok=True)
+        return False
+    part.replace(dest)
+    return True
 
-def parse_jsonl(content: str) -> list[dict]:
-    """Parse JSONL content, skip meta lines."""
+def parse_jsonl(path: Path) -> list[dict]:
+    """Parse JSONL file, skip meta lines."""
     records = []
-    for line in content.strip().split("\n"):
-        if not line.strip():
-            continue
-        try:
-            obj = json.loads(line)
+    with path.open("rb") as f:
+        for line in f:
+            line = line.rstrip(b"\r\n")
+            if not line:
+                continue
+            try:
+                obj = json_loads(line)
+            except ValueError:
+                continue
             if isinstance(obj, dict) and not obj.get("_meta") and not obj.get("_manifest"):
                 records.append(obj)
-        except:
-            pass
     return records
 
+def dumps_line(obj: dict) -> bytes:
+    """Serialise one JSONL line (UTF-8, trailing newline included)."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    # Same compact separators as orjson, so output bytes do not depend on whether it is installed
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
 def save_jsonl(path: Path, records: list[dict], meta: dict | None = None) -> None:
     """Save as JSONL."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    lines = []
-    if meta:
-        lines.append(json.dumps(meta, ensure_ascii=False))
-    for r in records:
-        lines.append(json.dumps(r, ensure_ascii=False))
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-def gist_upload(gist_id: str, filename: str, filepath: Path) -> bool:
-    """Upload file to gist."""
+    # One write() per WRITE_BATCH lines, without joining the whole file in memory
+    with path.open("wb") as f:
+        if meta:
+            f.write(dumps_line(meta))
+        for i in range(0, len(records), WRITE_BATCH):
+            f.write(b"".join(map(dumps_line, records[i:i + WRITE_BATCH])))
+
+def count_lines(path: Path) -> int:
+    """Count lines in a file by scanning 1 MiB byte chunks for newlines."""
+    count = 0
+    last = b"\n"
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            count += chunk.count(b"\n")
+            last = chunk[-1:]
+    # A final line without a trailing newline still counts
+    return count + (last != b"\n")
+
+def gist_upload(gist_id: str, files: dict[str, Path]) -> bool:
+    """Upload several files to a gist in one API call ({gist filename: local path})."""
+    # `gh gist edit` takes one file per call; PATCH /gists/{id} takes them all at once
+    payload = {
+        "files": {
+            filename: {"content": filepath.read_text(encoding="utf-8")}
+            for filename, filepath in files.items()
+        }
+    }
     result = subprocess.run(
-        ["gh", "gist", "edit", gist_id, "-f", filename, str(filepath)],
-        capture_output=True,
+        ["gh", "api", "--method", "PATCH", f"/gists/{gist_id}", "--input", "-"],
+        input=json.dumps(payload, ensure_ascii=False),
+        # The API echoes the whole gist back; only stderr is worth keeping
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         text=True,
         timeout=120,
     )
+    if result.returncode != 0:
+        print(f"  gh api failed: {result.stderr.strip()}", file=sys.stderr)
     return result.returncode == 0
 
 def main():
@@ -80,46 +132,54 @@ def main():
     out_dir = Path("data/restored")
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    all_raw_records = []
+    # First record per URL wins across topics; dicts keep insertion order. Keys
+    # are the records' own url strings (no copies), so hashing them saves no memory.
+    by_url = {}
+    total_raw = 0
+
+    # Download every topic's raw + clean file concurrently, straight to disk
+    destinations = {}
+    for topic in RESTORE_FROM:
+        destinations[topic, "raw.jsonl"] = out_dir / f"{topic}-raw-restored.jsonl"
+        destinations[topic, "clean.jsonl"] = out_dir / f"clean-{topic}.jsonl"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        downloads = {
+            (topic, filename): pool.submit(
+                fetch_gist_file, info["gist_id"], info["version"], filename, destinations[topic, filename]
+            )
+            for topic, info in RESTORE_FROM.items()
+            for filename in ("raw.jsonl", "clean.jsonl")
+        }
 
     # Download old versions with full data
-    for topic, info in RESTORE_FROM.items():
+    for topic in RESTORE_FROM:
         print(f"\n--- {topic} ---")
 
-        # Get raw.jsonl from good version
-        raw_content = fetch_gist_file(info["gist_id"], info["version"], "raw.jsonl")
-        if raw_content:
-            records = parse_jsonl(raw_content)
+        # Get raw.jsonl from good version (saved as backup)
+        if downloads[topic, "raw.jsonl"].result():
+            backup = destinations[topic, "raw.jsonl"]
+            records = parse_jsonl(backup)
             print(f"  raw.jsonl: {len(records)} records")
-            all_raw_records.extend(records)
-
-            # Save backup
-            backup = out_dir / f"{topic}-raw-restored.jsonl"
-            backup.write_text(raw_content, encoding="utf-8")
+            total_raw += len(records)
+            for r in records:
+                url = r.get("url")
+                if url:
+                    by_url.setdefault(url, r)
             print(f"  Saved: {backup}")
 
-        # Get clean.jsonl from good version
-        clean_content = fetch_gist_file(info["gist_id"], info["version"], "clean.jsonl")
-        if clean_content:
-            records = parse_jsonl(clean_content)
+        # Get clean.jsonl from good version (saved as clean-{topic}.jsonl)
+        if downloads[topic, "clean.jsonl"].result():
+            clean_path = destinations[topic, "clean.jsonl"]
+            records = parse_jsonl(clean_path)
             print(f"  clean.jsonl: {len(records)} records")
-
-            # Save as clean-{topic}.jsonl
-            clean_path = out_dir / f"clean-{topic}.jsonl"
-            clean_path.write_text(clean_content, encoding="utf-8")
             print(f"  Saved: {clean_path}")
 
-    # Dedupe merged raw by URL
+    # Raw records were deduped by URL as each topic was parsed
     print("\n--- Merging raw data ---")
-    seen = set()
-    unique_raw = []
-    for r in all_raw_records:
-        url = r.get("url")
-        if url and url not in seen:
-            seen.add(url)
-            unique_raw.append(r)
-
-    print(f"Total raw records: {len(all_raw_records)}")
+    unique_raw = list(by_url.values())
+
+    print(f"Total raw records: {total_raw}")
     print(f"After dedupe: {len(unique_raw)}")
 
     # Save merged raw
@@ -137,7 +197,7 @@ def main():
     print("\n" + "=" * 70)
     print("RESTORED FILES:")
     for f in sorted(out_dir.glob("*.jsonl")):
-        lines = len(f.read_text().strip().split("\n"))
+        lines = count_lines(f)
         print(f"  {f.name}: {lines} lines")
 
     print()
@@ -158,15 +218,18 @@ def main():
         ("clean-greenland-trump.jsonl", out_dir / "clean-greenland-trump.jsonl"),
     ]
 
+    existing = {}
     for filename, filepath in files_to_upload:
         if filepath.exists():
-            if gist_upload(NEW_GIST_ID, filename, filepath):
-                print(f"  ✓ {filename}")
-            else:
-                print(f"  ✗ {filename} (failed)")
+            existing[filename] = filepath
         else:
             print(f"  - {filename} (not found)")
 
+    if existing:
+        ok = gist_upload(NEW_GIST_ID, existing)
+        for filename in existing:
+            print(f"  ✓ {filename}" if ok else f"  ✗ {filename} (failed)")
+
     print(f"\n✓ Done! https://gist.github.com/{NEW_GIST_ID}")
     return 0
 
@@ -30,13 +30,26 @@ import argparse
 import hashlib
 import json
 import logging
+import multiprocessing
+import os
+import re
+import shutil
 import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import cache
 from pathlib import Path
 
 from config import get_topic_config, list_topics, DEFAULT_TOPIC
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
+
 # === Configuration ===
 SCRIPT_DIR = Path(__file__).parent.resolve()
 
@@ -52,32 +65,49 @@ OUTPUT_KEY_ORDER = ["media_url", "title", "description", "publish_date", "url",
 # Max words for description truncation
 MAX_DESCRIPTION_WORDS = 50
 
+# Line prefixes of the metadata headers written by create_meta_header / manifest.py
+META_PREFIXES = (b'{"_meta"', b'{"_manifest"')
+
+# Records serialised per write() call in write_jsonl
+WRITE_BATCH = 10_000
+
+# Date files per worker before load_all_from_raw uses a process pool
+PARALLEL_LOAD_MIN_FILES = 16
+
+# Maps each digit d to 9 - d, so newer dates sort first as plain strings
+INVERT_DIGITS = str.maketrans("0123456789", "9876543210")
+
 
 def truncate_description(text: str, max_words: int = MAX_DESCRIPTION_WORDS) -> str:
     """Truncate description to first N words, adding '...' if truncated."""
     if not text:
         return text
-    words = text.split()
+    # Stop splitting after max_words; anything beyond lands unsplit in one extra item
+    words = text.split(None, max_words)
     if len(words) <= max_words:
         return text
     return " ".join(words[:max_words]) + "..."
 
 
+@cache
 def get_raw_dir(topic: str) -> Path:
     """Get raw directory for a topic."""
     return SCRIPT_DIR / "raw" / topic
 
 
+@cache
 def get_combined_raw_file(topic: str) -> Path:
     """Get combined raw file path for gist upload."""
     return SCRIPT_DIR / "raw" / topic / "_combined.jsonl"
 
 
+@cache
 def get_output_file(topic: str) -> Path:
     """Get clean output file path for a topic."""
     return CLEAN_DIR / f"articles-{topic}.jsonl"
 
 
+@cache
 def get_tmp_output_file(topic: str) -> Path:
     """Get temp output file path for gist upload."""
     return TMP_OUTPUT_DIR / f"newsdata-{topic}.jsonl"
@@ -99,29 +129,76 @@ def load_jsonl(filepath: Path) -> list[dict]:
     entries = []
     if not filepath.exists():
         return entries
-    with open(filepath, "r", encoding="utf-8") as f:
+    # Binary mode: json parses the UTF-8 bytes itself, so skip the text decode
+    with open(filepath, "rb") as f:
         for line in f:
             line = line.strip()
-            if line:
-                entry = json.loads(line)
-                # Skip metadata entries
-                if entry.get("_meta") or entry.get("_manifest"):
-                    continue
-                entries.append(entry)
+            # Headers are written first in the file with their flag as the first key
+            if not line or line.startswith(META_PREFIXES):
+                continue
+            entry = json_loads(line)
+            # Skip metadata entries
+            if entry.get("_meta") or entry.get("_manifest"):
+                continue
+            entries.append(entry)
     return entries
 
 
+def dumps_line(obj: dict) -> bytes:
+    """Serialise one JSONL line (UTF-8, trailing newline included)."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    # Same compact separators as orjson, so output bytes do not depend on whether it is installed
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def write_jsonl(filepath: Path, meta: dict, records: list[dict]) -> None:
+    """Write a meta header line followed by one line per record.
+
+    Lines are joined in batches so each write() call carries WRITE_BATCH
+    records instead of one.
+    """
+    with open(filepath, "wb") as f:
+        f.write(dumps_line(meta))
+        for i in range(0, len(records), WRITE_BATCH):
+            f.write(b"".join(map(dumps_line, records[i:i + WRITE_BATCH])))
+
+
+def _fork_context():
+    """multiprocessing's 'fork' context, or None where fork is unavailable.
+
+    run-pipeline.py loads this script by path, so spawn/forkserver children
+    (the macOS default, and Linux's from Python 3.14) could not import
+    load_jsonl by module name; forked children inherit it instead.
+    """
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+
+
 def load_all_from_raw(topic: str, filename: str) -> list[dict]:
     """Load all entries from raw/{topic}/{date}/{filename} across all date directories."""
     all_entries = []
     raw_dir = get_raw_dir(topic)
     if not raw_dir.exists():
         return all_entries
-    for date_dir in sorted(raw_dir.iterdir()):
-        if date_dir.is_dir():
-            file_path = date_dir / filename
-            if file_path.exists():
-                all_entries.extend(load_jsonl(file_path))
+    paths = [
+        date_dir / filename
+        for date_dir in sorted(raw_dir.iterdir())
+        if date_dir.is_dir() and (date_dir / filename).exists()
+    ]
+    # Per-date files parse independently; spread long backfills across cores.
+    # Results are pickled back to this process, so it only pays off with many files.
+    workers = min(os.cpu_count() or 1, len(paths) // PARALLEL_LOAD_MIN_FILES)
+    mp_context = _fork_context() if workers > 1 else None
+    if mp_context is not None:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            for entries in pool.map(load_jsonl, paths, chunksize=4):
+                all_entries.extend(entries)
+    else:
+        for path in paths:
+            all_entries.extend(load_jsonl(path))
     return all_entries
 
 
@@ -154,15 +231,24 @@ def create_meta_header(topic: str, record_count: int, dates_collected: list[str]
     }
 
 
-def combine_raw_files(topic: str) -> Path:
+def combine_raw_files(
+    topic: str,
+    articles: list[dict] | None = None,
+    urls: list[dict] | None = None,
+) -> Path:
     """Combine all raw data into a single file with meta header.
     
     Merges urls.jsonl (publish_date, media_url, language, etc.) with
     articles.jsonl (description, success, etc.) by URL to create
     complete self-contained records.
+    
+    Pass already-loaded articles/urls entries to skip re-reading every
+    date directory.
     """
-    articles = load_all_from_raw(topic, "articles.jsonl")
-    urls = load_all_from_raw(topic, "urls.jsonl")
+    if articles is None:
+        articles = load_all_from_raw(topic, "articles.jsonl")
+    if urls is None:
+        urls = load_all_from_raw(topic, "urls.jsonl")
     dates = get_dates_collected(topic)
     
     # Build URL index from urls.jsonl
@@ -182,48 +268,98 @@ def combine_raw_files(topic: str) -> Path:
     
     combined_file = get_combined_raw_file(topic)
     
-    with open(combined_file, "w", encoding="utf-8") as f:
-        # Write meta header first
-        meta = create_meta_header(topic, len(combined_records), dates)
-        f.write(json.dumps(meta, ensure_ascii=False) + "\n")
-        
-        # Write all merged records
-        for record in combined_records:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    meta = create_meta_header(topic, len(combined_records), dates)
+    write_jsonl(combined_file, meta, combined_records)
     
     return combined_file
 
 
 def build_url_index(entries: list[dict], key: str = "url") -> dict[str, dict]:
-    """Build a dict mapping URL -> entry for fast lookups."""
+    """Build a dict mapping URL -> entry for fast lookups.
+
+    Values are the already-loaded entry dicts themselves, not copies, so the
+    index costs one hash slot per URL. Projecting them into smaller records
+    would allocate new objects while the source lists stay alive for
+    combine_raw_files().
+    """
     return {entry[key]: entry for entry in entries if key in entry}
 
 
-def is_topic_related(entry: dict, filter_keywords: list[str], exclude_keywords: list[str] | None = None) -> bool:
+def index_existing_entries(entries: list[dict]) -> tuple[dict[str, dict], int]:
+    """Map URL -> existing clean entry in one pass, keeping the first of any repeats.
+
+    Returns the index and the number of entries whose URL was already indexed
+    (a clean file should have none).
+    """
+    by_url = {}
+    duplicates = 0
+    for entry in entries:
+        if "url" not in entry:
+            continue
+        url = entry["url"]
+        if url in by_url:
+            duplicates += 1
+        else:
+            by_url[url] = entry
+    return by_url, duplicates
+
+
+def lower_keywords(keywords: list[str] | None) -> tuple[str, ...]:
+    """Lowercase a keyword list once so the per-entry filters don't have to."""
+    return tuple(keyword.lower() for keyword in keywords or ())
+
+
+def keyword_matcher(keywords_lc: tuple[str, ...]) -> re.Pattern | None:
+    """Compile lowercased keywords into one alternation (None if there are none).
+
+    A single search() over the text answers "does any keyword occur", instead of
+    one substring scan per keyword.
+    """
+    if not keywords_lc:
+        return None
+    return re.compile("|".join(map(re.escape, keywords_lc)))
+
+
+@cache
+def overlapping_keywords(keywords_lc: tuple[str, ...]) -> tuple[str, ...]:
+    """Keywords whose occurrences could share characters with another keyword's.
+
+    That happens when one keyword contains another or one's suffix is another's
+    prefix. A keyword_matcher() findall counts every other keyword exactly like
+    str.count, but may undercount these.
+    """
+    overlapping = set()
+    for a in keywords_lc:
+        for b in keywords_lc:
+            if a != b and (a in b or any(a.endswith(b[:i]) for i in range(1, len(b)))):
+                overlapping.update((a, b))
+    return tuple(kw for kw in keywords_lc if kw in overlapping)
+
+
+def is_topic_related(entry: dict, filter_re: re.Pattern | None, exclude_re: re.Pattern | None = None) -> bool:
     """Check if entry is related to topic based on title + description.
     
     Args:
         entry: Article entry dict
-        filter_keywords: Keywords that MUST be present (at least one)
-        exclude_keywords: Keywords that will EXCLUDE the article if present
+        filter_re: keyword_matcher() of keywords that MUST be present (at least one)
+        exclude_re: keyword_matcher() of keywords that will EXCLUDE the article if present
     """
     title = entry.get("title") or ""
     description = entry.get("description") or ""
-    text = (title + " " + description).lower()
+    text = f"{title} {description}".lower()
     
     # Must match at least one include keyword
-    if not any(keyword.lower() in text for keyword in filter_keywords):
+    if filter_re is None or not filter_re.search(text):
         return False
     
     # Must NOT match any exclude keyword
-    if exclude_keywords:
-        if any(keyword.lower() in text for keyword in exclude_keywords):
-            return False
+    if exclude_re is not None and exclude_re.search(text):
+        return False
     
     return True
 
 
-def is_topic_relevant(entry: dict, topic_keywords: list[str]) -> bool:
+def is_topic_relevant(entry: dict, topic_lc: tuple[str, ...], topic_re: re.Pattern | None) -> bool:
     """Strict topic relevance check - article must be PRIMARILY about the topic.
     
     Heuristic:
@@ -234,30 +370,55 @@ def is_topic_relevant(entry: dict, topic_keywords: list[str]) -> bool:
     
     Args:
         entry: Article entry dict
-        topic_keywords: Core keywords that define the topic (e.g., ["greenland", "denmark"])
+        topic_lc: Lowercased core keywords that define the topic (e.g., ("greenland", "denmark"))
+        topic_re: keyword_matcher(topic_lc)
     
     Returns:
         True if article is primarily about the topic
     """
-    if not topic_keywords:
+    if topic_re is None:
         return True  # No topic keywords configured = no filtering
     
+    # Check if any keyword is in the title (substring match); a title hit
+    # means the (much longer) description never needs lowercasing
     title = (entry.get("title") or "").lower()
-    description = (entry.get("description") or "").lower()
+    if topic_re.search(title):
+        return True
     
-    for keyword in topic_keywords:
-        kw = keyword.lower()
-        # Check if keyword in title (substring match)
-        if kw in title:
-            return True
-        # Check if keyword appears 2+ times in description
-        if description.count(kw) >= 2:
-            return True
+    description = (entry.get("description") or "").lower()
     
-    return False
+    # Check if some keyword appears 2+ times in description, counting every
+    # keyword in one findall pass instead of one count() pass per keyword
+    hits = Counter(topic_re.findall(description))
+    if any(n >= 2 for n in hits.values()):
+        return True
+    if not hits:
+        return False
+    # The fused scan may undercount keywords that overlap another; recount just those
+    return any(description.count(kw) >= 2 for kw in overlapping_keywords(topic_lc))
+
 
+def build_clean_entry(entry: dict, urls_data: dict, topic: str) -> dict:
+    """Build an output entry (OUTPUT_KEY_ORDER keys) from an article and its urls data.
 
-def entry_sort_key(entry: dict) -> tuple[str, str]:
+    Article fields win over urls fields for shared keys. Only the output keys
+    are looked up, rather than merging both full dicts first.
+    """
+    cleaned = {}
+    for key in OUTPUT_KEY_ORDER:
+        if key == "my_topic":
+            cleaned[key] = topic
+        elif key in entry:
+            cleaned[key] = entry[key]
+        elif key in urls_data:
+            cleaned[key] = urls_data[key]
+    # Truncate long descriptions (e.g., Daily Wire puts full article in meta description)
+    if cleaned.get("description"):
+        cleaned["description"] = truncate_description(cleaned["description"])
+    return cleaned
+
+
+def entry_sort_key(entry: dict) -> tuple[str, bytes]:
     """Return a deterministic sort key: (inverted_date, url_hash).
 
     This ensures:
@@ -265,13 +426,27 @@ def entry_sort_key(entry: dict) -> tuple[str, str]:
     - Items from the same day have stable pseudo-random order (via URL hash)
     - Fully deterministic: adding new items doesn't change existing items' positions
     - When budget truncates, oldest items are cut first
+
+    The raw MD5 digest sorts exactly like its hexdigest, so the order is the
+    same as the per-character inverted string + hexdigest key this replaced.
     """
     date = entry.get("publish_date", "0000-00-00")
-    inverted_date = "".join(str(9 - int(c)) if c.isdigit() else c for c in date)
-    url_hash = hashlib.md5(entry.get("url", "").encode()).hexdigest()
+    inverted_date = date.translate(INVERT_DIGITS)
+    url_hash = hashlib.md5(entry.get("url", "").encode()).digest()
     return (inverted_date, url_hash)
 
 
+def count_media_and_dates(entries: list[dict]) -> tuple[Counter, Counter]:
+    """Count entries per media_url and per publish_date.
+
+    Each field is pulled into a plain list first; Counter then tallies the
+    list in C instead of resuming a generator per entry.
+    """
+    media_col = [e.get("media_url", "unknown") for e in entries]
+    date_col = [e.get("publish_date", "unknown") for e in entries]
+    return Counter(media_col), Counter(date_col)
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(
         description="Build cleaned news articles JSONL from raw data."
@@ -314,8 +489,8 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 def print_output_stats(topic_config: dict, show_all: bool = False) -> int:
     """Describe the current output file without modifying anything."""
     topic = topic_config["name"]
-    filter_keywords = topic_config["filter_keywords"]
-    exclude_keywords = topic_config.get("exclude_keywords", [])
+    filter_re = keyword_matcher(lower_keywords(topic_config["filter_keywords"]))
+    exclude_re = keyword_matcher(lower_keywords(topic_config.get("exclude_keywords")))
     output_file = get_output_file(topic)
 
     if show_all:
@@ -337,11 +512,11 @@ def print_output_stats(topic_config: dict, show_all: bool = False) -> int:
         success_count = sum(1 for e in articles_entries if e.get("success", False))
         print(f"Successful scrapes: {success_count}")
 
-        media_counts = Counter(e.get("media_url", "unknown") for e in urls_entries)
-        date_counts = Counter(
+        media_counts = Counter([e.get("media_url", "unknown") for e in urls_entries])
+        date_counts = Counter([
             e.get("publish_date", "unknown")[:10] if e.get("publish_date") else "unknown"
             for e in urls_entries
-        )
+        ])
 
         english_count = sum(1 for e in urls_entries if e.get("language", "").lower() == "en")
         non_english_count = len(urls_entries) - english_count
@@ -351,7 +526,7 @@ def print_output_stats(topic_config: dict, show_all: bool = False) -> int:
             url = entry.get("url")
             desc_entry = desc_by_url.get(url, {})
             combined = {**entry, **desc_entry}
-            if is_topic_related(combined, filter_keywords, exclude_keywords):
+            if is_topic_related(combined, filter_re, exclude_re):
                 topic_related_count += 1
 
         print(f"\nFilter breakdown:")
@@ -377,8 +552,7 @@ def print_output_stats(topic_config: dict, show_all: bool = False) -> int:
     final_entries = load_jsonl(output_file)
     print(f"Output: {output_file} ({len(final_entries)} entries)")
 
-    media_counts = Counter(e.get("media_url", "unknown") for e in final_entries)
-    date_counts = Counter(e.get("publish_date", "unknown") for e in final_entries)
+    media_counts, date_counts = count_media_and_dates(final_entries)
 
     print("\nStories per media outlet:")
     for media, count in sorted(media_counts.items(), key=lambda x: (-x[1], x[0])):
@@ -391,8 +565,8 @@ def print_output_stats(topic_config: dict, show_all: bool = False) -> int:
     return 0
 
 
-def main():
-    args = parse_args()
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
 
     if args.list_topics:
         list_topics()
@@ -407,9 +581,11 @@ def main():
         sys.exit(1)
 
     topic = topic_config["name"]
-    filter_keywords = topic_config["filter_keywords"]
-    topic_keywords = topic_config.get("topic_keywords", [])
-    exclude_keywords = topic_config.get("exclude_keywords", [])
+    # Lowercase and compile keywords once rather than per entry in the filter loop
+    topic_lc = lower_keywords(topic_config.get("topic_keywords"))
+    filter_re = keyword_matcher(lower_keywords(topic_config["filter_keywords"]))
+    topic_re = keyword_matcher(topic_lc)
+    exclude_re = keyword_matcher(lower_keywords(topic_config.get("exclude_keywords")))
     output_file = get_output_file(topic)
     tmp_output_file = get_tmp_output_file(topic)
 
@@ -446,7 +622,10 @@ def main():
 
     # Build URL indexes
     urls_by_url = build_url_index(urls_entries)
-    existing_urls = {entry["url"] for entry in existing_entries if "url" in entry}
+    # Existing entries by URL (only --append has any); new entries join it as they are kept
+    existing_by_url, count_duplicate_existing = index_existing_entries(existing_entries)
+    if count_duplicate_existing:
+        problems.append(f"Existing clean file has {count_duplicate_existing} entries with a repeated URL")
 
     # Stats
     count_articles = len(articles_entries)
@@ -460,6 +639,10 @@ def main():
     count_skipped_not_relevant = 0
     missing_urls = []
 
+    # Per-outlet / per-date totals for the output, tallied as entries are kept
+    # rather than in another pass over the merged list
+    media_counts, date_counts = count_media_and_dates(existing_entries)
+
     # Process articles
     new_entries = []
 
@@ -475,47 +658,39 @@ def main():
             continue
 
         # Skip if already in output
-        if url in existing_urls:
+        if url in existing_by_url:
             count_skipped_already_exists += 1
             continue
 
-        # Look up supplementary data from urls file
-        if url not in urls_by_url:
+        # Look up supplementary data from urls file (one dict probe, not two)
+        urls_data = urls_by_url.get(url)
+        if urls_data is None:
             missing_urls.append(url)
             continue
 
-        urls_data = urls_by_url[url]
-
         # Filter out non-English entries
         if urls_data.get("language", "").lower() != "en":
             count_skipped_non_english += 1
             continue
 
         # Filter out non-topic-related entries (broad filter)
-        if not is_topic_related(entry, filter_keywords, exclude_keywords):
+        if not is_topic_related(entry, filter_re, exclude_re):
             count_skipped_not_topic += 1
             continue
 
         # Build cleaned entry with specified key order
-        combined = {**urls_data, **entry}  # entry overwrites urls_data for shared keys
-        
-        # Ensure my_topic is set
-        combined["my_topic"] = topic
-        
-        # Truncate long descriptions (e.g., Daily Wire puts full article in meta description)
-        if combined.get("description"):
-            combined["description"] = truncate_description(combined["description"])
-        
-        cleaned_entry = {k: combined[k] for k in OUTPUT_KEY_ORDER if k in combined}
+        cleaned_entry = build_clean_entry(entry, urls_data, topic)
 
         # Strict topic relevance filter (must be PRIMARILY about the topic)
-        if topic_keywords and not is_topic_relevant(cleaned_entry, topic_keywords):
+        if topic_re and not is_topic_relevant(cleaned_entry, topic_lc, topic_re):
             count_skipped_not_relevant += 1
             continue
 
         new_entries.append(cleaned_entry)
-        existing_urls.add(url)  # Prevent duplicates within this run
+        existing_by_url[url] = cleaned_entry  # Prevent duplicates within this run
         count_added += 1
+        media_counts[cleaned_entry.get("media_url", "unknown")] += 1
+        date_counts[cleaned_entry.get("publish_date", "unknown")] += 1
 
     # CRITICAL ERROR: URLs not found in urls file
     if missing_urls:
@@ -584,12 +759,9 @@ def main():
     all_entries = existing_entries + new_entries
     all_entries.sort(key=entry_sort_key)
 
-    # Print stories per media_url and date
-    media_counts = Counter(e.get("media_url", "unknown") for e in all_entries)
-    date_counts = Counter(e.get("publish_date", "unknown") for e in all_entries)
-
+    # Print stories per media_url and date (ties by name, as in --stats)
     print("\nStories per media outlet:")
-    for media, count in sorted(media_counts.items(), key=lambda x: -x[1]):
+    for media, count in sorted(media_counts.items(), key=lambda x: (-x[1], x[0])):
         print(f"   {media}: {count}")
 
     print("\nStories per date:")
@@ -607,21 +779,16 @@ def main():
         meta = create_meta_header(topic, len(all_entries), dates)
         
         # Write to output file with meta header
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(json.dumps(meta, ensure_ascii=False) + "\n")
-            for entry in all_entries:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        write_jsonl(output_file, meta, all_entries)
         print(f"Written to: {output_file}")
 
-        # Also write to /tmp for gist upload (same content)
-        with open(tmp_output_file, "w", encoding="utf-8") as f:
-            f.write(json.dumps(meta, ensure_ascii=False) + "\n")
-            for entry in all_entries:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # Also copy to /tmp for gist upload (same content; copyfile is a kernel-side
+        # copy, and /tmp is often tmpfs so a hardlink wouldn't work anyway)
+        shutil.copyfile(output_file, tmp_output_file)
         print(f"Written to: {tmp_output_file} (for gist upload)")
         
         # Also combine raw files for gist upload
-        combined_raw = combine_raw_files(topic)
+        combined_raw = combine_raw_files(topic, articles_entries, urls_entries)
         print(f"Combined raw: {combined_raw}")
         
         print(f"   ({len(all_entries)} clean entries)")
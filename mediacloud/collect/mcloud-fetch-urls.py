@@ -337,7 +337,7 @@ def run_stats(client, topic_config: dict, start_date: dt.date, end_date: dt.date
     print()
 
 
-def main():
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="Fetch news stories from MediaCloud for a topic")
     parser.add_argument("--topic", type=str, default=None,
                         help=f"Topic to collect (default: {DEFAULT_TOPIC})")
@@ -346,7 +346,7 @@ def main():
     parser.add_argument("--end", type=str, help="End date YYYY-MM-DD (default: today)")
     parser.add_argument("--days", type=int, help="Only collect N most recent days (for trial runs)")
     parser.add_argument("--list-topics", action="store_true", help="List available topics and exit")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.list_topics:
         list_topics()
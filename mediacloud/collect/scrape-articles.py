@@ -11,18 +11,29 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import multiprocessing
+import os
 import random
+import re
+import sqlite3
 import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timezone, date
+from itertools import chain, zip_longest
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
 
+import lxml.etree
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 from tenacity import Retrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 # Import config from parent directory
@@ -34,20 +45,68 @@ try:
 except Exception:  # pragma: no cover
     tqdm = None
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
+
+# Meta/manifest lines lead with their marker key, so they can be skipped unparsed
+META_PREFIXES = (b'{"_meta"', b'{"_manifest"')
+
 DEFAULT_UA = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
 
 
+# Hosts each worker keeps warm connections to (roughly the outlet list)
+POOL_HOSTS = 32
+
+# Only <head> is needed, so stop downloading a page after this much
+MAX_HTML_BYTES = 256 * 1024
+HTML_CHUNK_BYTES = 64 * 1024
+# Unread bodies up to this size are drained so the connection goes back to the
+# pool; closing mid-body would cost a fresh TCP+TLS handshake on the next URL
+DRAIN_MAX_BYTES = 256 * 1024
+
+# Tasks queued per worker thread; enough to keep workers busy between refills
+IN_FLIGHT_PER_WORKER = 4
+
+_tls = threading.local()
+
+# Optional process pool for extract_meta (MINA_PARSE_WORKERS > 0); off by
+# default since head-only pages parse quickly on the fetch threads
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+# Per-topic ETag/Last-Modified store for conditional re-fetches (--no-http-cache disables)
+HTTP_CACHE_FILE = "http_cache.sqlite"
+# Commit after this many puts or seconds, so an interrupted run keeps most of its validators
+HTTP_CACHE_COMMIT_EVERY = 200
+HTTP_CACHE_COMMIT_SECONDS = 10.0
+_HTTP_CACHE: Optional["ValidatorCache"] = None
+
+
 class FetchError(RuntimeError):
-    pass
+    """Worth retrying: 408/429 and 5xx responses."""
+
+
+class PermanentFetchError(RuntimeError):
+    """Other 4xx responses; retrying a dead or forbidden URL won't change the answer."""
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _dumps_line(obj: dict[str, Any]) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    # Same compact separators as orjson, so output bytes do not depend on whether it is installed
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
 def _is_jsonl(path: Path) -> bool:
     return path.suffix.lower() in {".jsonl", ".ndjson"}
 
@@ -76,15 +135,19 @@ def load_records(path: Path) -> list[dict[str, Any]]:
 
     if _is_jsonl(path):
         records: list[dict[str, Any]] = []
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                obj = json.loads(line)
-                # Skip manifest/meta entries
-                if isinstance(obj, dict) and (obj.get("_manifest") or obj.get("_meta")):
+        with path.open("rb") as f:
+            for raw in f:
+                line = raw.strip()
+                # Skip manifest/meta entries before parsing them
+                if not line or line.startswith(META_PREFIXES) or b'"_manifest"' in line[:64]:
                     continue
+                try:
+                    obj = json_loads(line)
+                except ValueError:
+                    # Last line still being written (fetch runs alongside the scraper)
+                    if not raw.endswith(b"\n"):
+                        break
+                    raise
                 records.extend(_normalize_loaded_obj(obj))
         return records
 
@@ -100,19 +163,64 @@ def get_url(record: dict[str, Any]) -> Optional[str]:
     return None
 
 
+_URL_FIELD_RE = re.compile(rb'"url"\s*:\s*"([^"\\]*)"')
+
+
+def repair_partial_line(path: Path) -> None:
+    """Make a JSONL file end on a line break before it is appended to.
+
+    A killed run can leave half a record as the last line; it is cut off (its
+    URL gets scraped again). A complete record that only lacks the final
+    newline is kept and the newline added.
+    """
+    with path.open("r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        # Walk back in blocks to the last complete line
+        pos = end
+        cut = 0
+        while pos > 0:
+            step = min(HTML_CHUNK_BYTES, pos)
+            pos -= step
+            f.seek(pos)
+            i = f.read(step).rfind(b"\n")
+            if i != -1:
+                cut = pos + i + 1
+                break
+        f.seek(cut)
+        try:
+            json_loads(f.read())
+        except ValueError:
+            f.truncate(cut)
+        else:
+            f.seek(0, os.SEEK_END)
+            f.write(b"\n")
+
+
 def read_urls_from_output(path: Path) -> set[str]:
     if not path.exists():
         return set()
 
     urls: set[str] = set()
     if _is_jsonl(path):
-        with path.open("r", encoding="utf-8") as f:
+        with path.open("rb") as f:
             for line in f:
                 line = line.strip()
-                if not line:
+                if not line or line.startswith(META_PREFIXES):
+                    continue
+                # Only the url is needed; pull it straight from the bytes and
+                # fall back to a full parse when it is escaped or absent. A
+                # line cut short by an interrupted run never ends in "}".
+                m = _URL_FIELD_RE.search(line) if line.endswith(b"}") else None
+                if m:
+                    urls.add(m.group(1).decode("utf-8", "replace").strip())
                     continue
                 try:
-                    obj = json.loads(line)
+                    obj = json_loads(line)
                 except Exception:
                     continue
                 if isinstance(obj, dict):
@@ -135,41 +243,232 @@ def read_urls_from_output(path: Path) -> set[str]:
     return urls
 
 
-def write_jsonl(path: Path, records: Iterable[dict[str, Any]], *, append: bool) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    mode = "a" if append else "w"
-    with path.open(mode, encoding="utf-8") as f:
-        for r in records:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+# (attribute, value) pairs of the <meta> tags to read, in priority order
+DESCRIPTION_META = (
+    ("name", "description"),
+    ("property", "og:description"),
+    ("name", "twitter:description"),
+)
+TITLE_META = (("property", "og:title"), ("name", "twitter:title"))
 
+# Built once and shared; comments, PIs and the id index are never read
+_HTML_PARSER = lxml.html.HTMLParser(
+    encoding="utf-8", remove_comments=True, remove_pis=True, collect_ids=False
+)
 
-def extract_description_from_html(html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "lxml")
-    for key, val in (
-        ("name", "description"),
-        ("property", "og:description"),
-        ("name", "twitter:description"),
-    ):
-        tag = soup.find("meta", attrs={key: val})
-        if tag and tag.get("content"):
-            c = str(tag.get("content")).strip()
-            if c:
-                return c
+
+def _meta_content(first_meta: dict[tuple[str, str], Optional[str]], keys) -> Optional[str]:
+    for key in keys:
+        c = (first_meta.get(key) or "").strip()
+        if c:
+            return c
     return None
 
 
-def extract_title_from_html(html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "lxml")
-    for key, val in (("property", "og:title"), ("name", "twitter:title")):
-        tag = soup.find("meta", attrs={key: val})
-        if tag and tag.get("content"):
-            c = str(tag.get("content")).strip()
-            if c:
-                return c
-    if soup.title and soup.title.string:
-        t = soup.title.string.strip()
-        return t or None
-    return None
+def extract_meta(html: str) -> tuple[Optional[str], Optional[str]]:
+    """Return (title, description) from one lxml parse of the page."""
+    try:
+        # Parse bytes: lxml rejects str input that carries an XML encoding declaration
+        tree = lxml.html.document_fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+    except lxml.etree.ParserError:  # empty document
+        return None, None
+
+    # Content of the first <meta> per name/property value, like soup.find() would pick
+    first_meta: dict[tuple[str, str], Optional[str]] = {}
+    for el in tree.iter("meta"):
+        for attr in ("name", "property"):
+            val = el.get(attr)
+            if val is not None:
+                first_meta.setdefault((attr, val), el.get("content"))
+
+    description = _meta_content(first_meta, DESCRIPTION_META)
+    title = _meta_content(first_meta, TITLE_META)
+    if title is None:
+        title_el = next(tree.iter("title"), None)
+        if title_el is not None and title_el.text:
+            title = title_el.text.strip() or None
+    return title, description
+
+
+# Recent extract_meta results by page digest: templated heads (wire copies,
+# error and paywall pages) repeat across a run and need parsing only once
+META_CACHE_SIZE = 4096
+_meta_cache: OrderedDict[bytes, tuple[Optional[str], Optional[str]]] = OrderedDict()
+_meta_cache_lock = threading.Lock()
+
+
+def _parse_meta(html: str) -> tuple[Optional[str], Optional[str]]:
+    """Cached extract_meta, on the parse pool when one is running."""
+    key = hashlib.blake2b(html.encode("utf-8"), digest_size=16).digest()
+    with _meta_cache_lock:
+        hit = _meta_cache.get(key)
+        if hit is not None:
+            _meta_cache.move_to_end(key)
+            return hit
+
+    if _PARSE_POOL is None:
+        meta = extract_meta(html)
+    else:
+        meta = _PARSE_POOL.submit(extract_meta, html).result()
+
+    with _meta_cache_lock:
+        _meta_cache[key] = meta
+        if len(_meta_cache) > META_CACHE_SIZE:
+            _meta_cache.popitem(last=False)
+    return meta
+
+
+def _session() -> requests.Session:
+    """Per-thread Session, so repeat hosts reuse a connection instead of a new TLS handshake."""
+    sess = getattr(_tls, "session", None)
+    if sess is None:
+        sess = requests.Session()
+        # Retries stay with tenacity in fetch_html
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, max_retries=0)
+        sess.mount("http://", adapter)
+        sess.mount("https://", adapter)
+        _tls.session = sess
+    return sess
+
+
+def _read_head(chunks: Iterator[bytes]) -> bytes:
+    """Read the body only until </head> (or MAX_HTML_BYTES); the metadata lives there."""
+    buf = bytearray()
+    for chunk in chunks:
+        # Rescan a few bytes before the new chunk in case the tag straddles chunks
+        start = max(0, len(buf) - 6)
+        buf += chunk
+        if len(buf) >= MAX_HTML_BYTES:
+            break
+        if buf.find(b"</head", start) != -1 or buf.find(b"</HEAD", start) != -1:
+            break
+    return bytes(buf)
+
+
+def _drain(resp: requests.Response, chunks: Optional[Iterator[bytes]] = None) -> None:
+    """Read and discard the rest of a small body so its connection can be reused.
+
+    Large bodies are left unread; closing the response then drops the
+    connection, which is cheaper than downloading them. Without a
+    Content-Length the size is unknown, so at most one more chunk is read.
+
+    Pass the iterator _read_head stopped in: for a chunked body, abandoning an
+    iter_content generator mid-body makes urllib3 close the connection.
+    """
+    length = resp.headers.get("Content-Length", "")
+    if not length.isdigit():
+        budget = HTML_CHUNK_BYTES
+    elif int(length) - resp.raw.tell() > DRAIN_MAX_BYTES:
+        return
+    else:
+        budget = DRAIN_MAX_BYTES
+    drained = 0
+    try:
+        if chunks is None:
+            chunks = resp.iter_content(HTML_CHUNK_BYTES)
+        for chunk in chunks:
+            drained += len(chunk)
+            if drained >= budget:
+                return
+    except requests.RequestException:
+        pass  # the metadata is already in hand; just don't reuse this connection
+
+
+class HostLimiter:
+    """Spaces out requests to the same host; different hosts never wait on each other."""
+
+    def __init__(self, delay_min: float, delay_max: float):
+        self.delay_min = delay_min
+        self.delay_max = max(delay_min, delay_max)
+        self._next: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        if self.delay_max <= 0:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + random.uniform(self.delay_min, self.delay_max)
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class ValidatorCache:
+    """ETag / Last-Modified and the extracted metadata per URL, in a sqlite sidecar.
+
+    Lets a re-scrape send a conditional GET; a 304 reuses the stored result.
+    """
+
+    def __init__(self, path: Path):
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages (url TEXT PRIMARY KEY, etag TEXT, "
+            "last_modified TEXT, final_url TEXT, http_status INTEGER, title TEXT, description TEXT)"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def get(self, url: str) -> Optional[tuple]:
+        """(etag, last_modified, final_url, http_status, title, description) or None."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT etag, last_modified, final_url, http_status, title, description "
+                "FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+    def put(self, url: str, validators: dict[str, str], final_url: str, status: int,
+            title: Optional[str], description: Optional[str]) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, validators.get("etag"), validators.get("last_modified"),
+                 final_url, status, title, description),
+            )
+            self._pending += 1
+            now = time.monotonic()
+            if (self._pending >= HTTP_CACHE_COMMIT_EVERY
+                    or now - self._last_commit >= HTTP_CACHE_COMMIT_SECONDS):
+                self._db.commit()
+                self._pending = 0
+                self._last_commit = now
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+
+
+def decode_html(body: bytes, content_type: str = "") -> str:
+    """Decode with the declared charset (Content-Type, then <meta>), else sniff cheaply.
+
+    Undeclared pages are tried as UTF-8 and fall back to cp1252 (what browsers
+    assume), instead of running statistical detection over the body.
+    """
+    m = _HEADER_CHARSET_RE.search(content_type)
+    declared = m.group(1) if m else None
+    if declared is None:
+        m = _META_CHARSET_RE.search(body, 0, 4096)
+        declared = m.group(1).decode("ascii", "replace") if m else None
+    if declared:
+        try:
+            return body.decode(declared, errors="replace")
+        except LookupError:
+            pass
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the size cap is still UTF-8
+        if e.start >= len(body) - 3:
+            return body.decode("utf-8", errors="replace")
+        return body.decode("cp1252", errors="replace")
 
 
 @dataclass(frozen=True)
@@ -180,26 +479,57 @@ class FetchConfig:
     user_agent: str
 
 
-def fetch_html(url: str, *, cfg: FetchConfig) -> tuple[str, str, int]:
+def fetch_html(
+    url: str, *, cfg: FetchConfig, cached: Optional[tuple] = None
+) -> tuple[str, str, int, dict[str, str]]:
+    """Return (html, final_url, status, validators).
+
+    With a `cached` ValidatorCache row the request is conditional; a 304 comes
+    back with empty html. validators holds the response's etag/last_modified.
+    """
     headers = {
         "User-Agent": cfg.user_agent,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
     }
-
-    def _do_get() -> tuple[str, str, int]:
-        resp = requests.get(url, headers=headers, timeout=cfg.timeout, allow_redirects=True)
-        status = int(resp.status_code)
-        if status >= 400:
-            raise FetchError(f"HTTP {status}")
-        resp.encoding = resp.encoding or resp.apparent_encoding
-        return resp.text, resp.url, status
+    if cached is not None:
+        if cached[0]:
+            headers["If-None-Match"] = cached[0]
+        if cached[1]:
+            headers["If-Modified-Since"] = cached[1]
+
+    def _do_get() -> tuple[str, str, int, dict[str, str]]:
+        with _session().get(
+            url, headers=headers, timeout=cfg.timeout, allow_redirects=True, stream=True
+        ) as resp:
+            status = int(resp.status_code)
+            if status >= 400:
+                _drain(resp)
+                if status < 500 and status not in (408, 429):
+                    raise PermanentFetchError(f"HTTP {status}")
+                raise FetchError(f"HTTP {status}")
+            validators = {
+                k: v
+                for k, v in (("etag", resp.headers.get("ETag")),
+                             ("last_modified", resp.headers.get("Last-Modified")))
+                if v
+            }
+            if status == 304:
+                _drain(resp)
+                return "", resp.url, status, validators
+            chunks = resp.iter_content(HTML_CHUNK_BYTES)
+            body = _read_head(chunks)
+            _drain(resp, chunks)
+            text = decode_html(body, resp.headers.get("Content-Type", ""))
+            return text, resp.url, status, validators
 
     for attempt in Retrying(
         reraise=True,
         stop=stop_after_attempt(max(1, int(cfg.retries))),
         wait=wait_exponential(multiplier=1, min=1, max=float(cfg.backoff_max)),
-        retry=retry_if_exception_type((requests.RequestException, FetchError)),
+        retry=retry_if_exception_type(
+            (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError, FetchError)
+        ),
     ):
         with attempt:
             return _do_get()
@@ -211,13 +541,29 @@ def scrape_article(url: str, topic: str, *, cfg: FetchConfig) -> dict[str, Any]:
     """Scrape article metadata and add my_topic field."""
     scraped_at = _now_iso()
     try:
-        html, final_url, status = fetch_html(url, cfg=cfg)
+        cached = None
+        if _HTTP_CACHE is not None:
+            try:
+                cached = _HTTP_CACHE.get(url)
+            except sqlite3.Error as e:
+                print(f"Warning: HTTP cache read failed for {url}: {e}", file=sys.stderr)
+        html, final_url, status, validators = fetch_html(url, cfg=cfg, cached=cached)
+        if status == 304 and cached is not None:
+            # Unchanged since the last scrape: reuse what was extracted then
+            final_url, status, title, description = cached[2:]
+        else:
+            title, description = _parse_meta(html)
+            if _HTTP_CACHE is not None and validators:
+                try:
+                    _HTTP_CACHE.put(url, validators, final_url, status, title, description)
+                except sqlite3.Error as e:
+                    print(f"Warning: HTTP cache write failed for {url}: {e}", file=sys.stderr)
         return {
             "url": url,
             "final_url": final_url,
             "http_status": status,
-            "description": extract_description_from_html(html),
-            "title": extract_title_from_html(html),
+            "description": description,
+            "title": title,
             "success": True,
             "error": None,
             "scraped_at": scraped_at,
@@ -237,10 +583,45 @@ def scrape_article(url: str, topic: str, *, cfg: FetchConfig) -> dict[str, Any]:
         }
 
 
-def _progress(total: int, desc: str):
+def interleave_by_host(urls: list[str]) -> list[str]:
+    """Round-robin URLs across hosts, keeping each host's own order.
+
+    Consecutive tasks then go to different outlets, so workers rarely queue
+    behind HostLimiter for the same host, while each thread's Session keeps
+    its connections to those hosts warm.
+    """
+    by_host: defaultdict[str, list[str]] = defaultdict(list)
+    for u in urls:
+        by_host[urlsplit(u).netloc].append(u)
+    if len(by_host) <= 1:
+        return urls
+    return [u for u in chain.from_iterable(zip_longest(*by_host.values())) if u is not None]
+
+
+_END = object()
+
+
+def _imap_unordered(ex: ThreadPoolExecutor, fn, items: list, window: int) -> Iterable[Any]:
+    """Yield fn(item) results as they finish, keeping at most `window` tasks queued.
+
+    Futures are created as slots free up instead of all up front, so a long
+    work list doesn't sit in the executor queue as one Future per URL.
+    """
+    it = iter(items)
+    pending = {ex.submit(fn, x) for _, x in zip(range(window), it)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            nxt = next(it, _END)
+            if nxt is not _END:
+                pending.add(ex.submit(fn, nxt))
+            yield fut.result()
+
+
+def _progress(total: int, desc: str, position: Optional[int] = None):
     if tqdm is None:
         return None
-    return tqdm(total=total, desc=desc, unit="url")
+    return tqdm(total=total, desc=desc, unit="url", position=position)
 
 
 # Paths
@@ -269,8 +650,8 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
                    help="Specific date to process (YYYY-MM-DD). Default: all dates.")
     p.add_argument("--trial3", action="store_true", help="Sample 3 random URLs and print descriptions.")
     p.add_argument("--workers", "-w", type=int, default=2, help="Parallel workers.")
-    p.add_argument("--delay-min", type=float, default=0.3, help="Min delay between requests (seconds).")
-    p.add_argument("--delay-max", type=float, default=0.8, help="Max delay between requests (seconds).")
+    p.add_argument("--delay-min", type=float, default=0.3, help="Min delay between requests to the same host (seconds).")
+    p.add_argument("--delay-max", type=float, default=0.8, help="Max delay between requests to the same host (seconds).")
     p.add_argument("--timeout", type=float, default=20, help="Per-request timeout in seconds.")
     p.add_argument("--retries", type=int, default=5, help="Max attempts per URL (includes first try).")
     p.add_argument("--backoff-max", type=float, default=60, help="Max exponential backoff between retries.")
@@ -278,6 +659,10 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     p.add_argument("--limit", type=int, default=None, help="Only process first N records.")
     p.add_argument("--user-agent", type=str, default=DEFAULT_UA, help="Custom User-Agent.")
     p.add_argument("--list-topics", action="store_true", help="List available topics and exit.")
+    p.add_argument("--date-parallel", type=int, default=1,
+                   help="Date directories to scrape at once (they share the worker pool).")
+    p.add_argument("--no-http-cache", action="store_true",
+                   help="Always do full fetches; don't read or write the ETag/Last-Modified cache.")
     return p.parse_args(argv)
 
 
@@ -286,8 +671,16 @@ def process_date_dir(
     topic: str,
     cfg: FetchConfig,
     args: argparse.Namespace,
+    pool: Optional[ThreadPoolExecutor] = None,
+    limiter: Optional[HostLimiter] = None,
+    position: Optional[int] = None,
 ) -> tuple[int, int]:
-    """Process a single date directory. Returns (ok_count, fail_count)."""
+    """Process a single date directory. Returns (ok_count, fail_count).
+
+    With workers > 1, URLs run on `pool` (one is created if not given).
+    Pass a shared `limiter` when several directories are scraped at once,
+    and a tqdm `position` so their progress bars don't overwrite each other.
+    """
     input_path = date_dir / "urls.jsonl"
     output_path = date_dir / "articles.jsonl"  # Changed from descriptions.jsonl
 
@@ -299,8 +692,8 @@ def process_date_dir(
     if args.limit is not None:
         records = records[: max(0, int(args.limit))]
 
-    urls_raw = [get_url(r) for r in records]
-    urls = list(dict.fromkeys([u for u in urls_raw if u]))
+    # Unique URLs in first-seen order, in one pass over the records
+    urls = list(dict.fromkeys(filter(None, map(get_url, records))))
     if not urls:
         print(f"  Skipping {date_dir.name}: no URLs found")
         return 0, 0
@@ -317,31 +710,37 @@ def process_date_dir(
                 print(f"DESCRIPTION: {res.get('description') or ''}", flush=True)
         return 0, 0
 
+    append = bool(not args.no_resume and output_path.exists() and _is_jsonl(output_path))
+    if append:
+        repair_partial_line(output_path)
     already = read_urls_from_output(output_path) if not args.no_resume else set()
-    work = [u for u in urls if u not in already]
+    work = interleave_by_host([u for u in urls if u not in already])
     if not work:
         print(f"  {date_dir.name}: nothing to do ({len(already)} already scraped)")
         return 0, 0
 
     print(f"  {date_dir.name}: scraping {len(work)} URLs ({len(already)} already done)")
 
-    delay_min = float(args.delay_min)
-    delay_max = float(args.delay_max)
+    if limiter is None:
+        limiter = HostLimiter(float(args.delay_min), float(args.delay_max))
 
     def do_one(u: str) -> dict[str, Any]:
-        if args.workers > 1 and (delay_min > 0 or delay_max > 0):
-            time.sleep(random.uniform(delay_min, max(delay_min, delay_max)))
+        limiter.wait(u)
         return scrape_article(u, topic, cfg=cfg)
 
-    out: list[dict[str, Any]] = []
+    # Write and flush each record as soon as it completes: memory stays flat, and
+    # an interrupted run keeps what it scraped (resume skips those URLs next time)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     ok = 0
     fail = 0
-    pbar = _progress(total=len(work), desc=f"Scraping {date_dir.name}")
+    pbar = _progress(total=len(work), desc=f"Scraping {date_dir.name}", position=position)
+
+    with output_path.open("ab" if append else "wb") as out_f:
 
-    if int(args.workers) <= 1:
-        for idx, u in enumerate(work):
-            res = do_one(u)
-            out.append(res)
+        def record(res: dict[str, Any]) -> None:
+            nonlocal ok, fail
+            out_f.write(_dumps_line(res))
+            out_f.flush()
             if res.get("success") is True:
                 ok += 1
             else:
@@ -349,28 +748,23 @@ def process_date_dir(
             if pbar is not None:
                 pbar.update(1)
                 pbar.set_postfix(ok=ok, fail=fail)
-            if idx < len(work) - 1 and (delay_min > 0 or delay_max > 0):
-                time.sleep(random.uniform(delay_min, max(delay_min, delay_max)))
-    else:
-        with ThreadPoolExecutor(max_workers=int(args.workers)) as ex:
-            futures = [ex.submit(do_one, u) for u in work]
-            for fut in as_completed(futures):
-                res = fut.result()
-                out.append(res)
-                if res.get("success") is True:
-                    ok += 1
-                else:
-                    fail += 1
-                if pbar is not None:
-                    pbar.update(1)
-                    pbar.set_postfix(ok=ok, fail=fail)
+
+        if int(args.workers) <= 1:
+            for u in work:
+                record(do_one(u))
+        else:
+            ex = pool or ThreadPoolExecutor(max_workers=int(args.workers))
+            try:
+                for res in _imap_unordered(ex, do_one, work, int(args.workers) * IN_FLIGHT_PER_WORKER):
+                    record(res)
+            finally:
+                if pool is None:
+                    ex.shutdown()
 
     if pbar is not None:
         pbar.close()
 
-    append = bool(not args.no_resume and output_path.exists() and _is_jsonl(output_path))
-    write_jsonl(output_path, out, append=append)
-    print(f"    Wrote {len(out)} records (ok={ok}, fail={fail})")
+    print(f"    Wrote {ok + fail} records for {date_dir.name} (ok={ok}, fail={fail})")
 
     return ok, fail
 
@@ -419,10 +813,60 @@ def main(argv: Optional[list[str]] = None) -> int:
     total_ok = 0
     total_fail = 0
 
-    for date_dir in date_dirs:
-        ok, fail = process_date_dir(date_dir, topic, cfg, args)
-        total_ok += ok
-        total_fail += fail
+    # One pool for the whole run: worker threads (and their per-thread Sessions
+    # with warm connections) carry over from one date directory to the next
+    pool = ThreadPoolExecutor(max_workers=int(args.workers)) if int(args.workers) > 1 else None
+
+    # Parsing holds the GIL; with many fetch workers it can move to processes
+    global _PARSE_POOL, _HTTP_CACHE
+    parse_workers = int(os.environ.get("MINA_PARSE_WORKERS") or 0)
+    if parse_workers > 0:
+        # Pinned to fork: this script is loaded by path (as scrape_articles when
+        # run from run-pipeline.py), so spawn/forkserver children could not
+        # import extract_meta by name. Without fork, parsing stays on the fetch threads.
+        try:
+            mp_context = multiprocessing.get_context("fork")
+        except ValueError:
+            print("MINA_PARSE_WORKERS ignored: no fork start method on this platform", file=sys.stderr)
+        else:
+            _PARSE_POOL = ProcessPoolExecutor(
+                max_workers=min(parse_workers, os.cpu_count() or 1), mp_context=mp_context
+            )
+            # A fork pool starts every worker on its first task; do that now,
+            # before any fetch thread exists, rather than from inside one
+            _PARSE_POOL.submit(int).result()
+    if not args.no_http_cache:
+        _HTTP_CACHE = ValidatorCache(get_raw_dir(topic) / HTTP_CACHE_FILE)
+    # Shared across directories so concurrent dates still space out requests per host
+    limiter = HostLimiter(float(args.delay_min), float(args.delay_max))
+    date_parallel = max(1, int(args.date_parallel))
+    try:
+        if date_parallel > 1 and len(date_dirs) > 1:
+            # Overlap one date's slow tail with the next date's start
+            with ThreadPoolExecutor(max_workers=date_parallel) as outer:
+                results = outer.map(
+                    lambda i: process_date_dir(
+                        date_dirs[i], topic, cfg, args, pool, limiter, i % date_parallel
+                    ),
+                    range(len(date_dirs)),
+                )
+                for ok, fail in results:
+                    total_ok += ok
+                    total_fail += fail
+        else:
+            for date_dir in date_dirs:
+                ok, fail = process_date_dir(date_dir, topic, cfg, args, pool, limiter)
+                total_ok += ok
+                total_fail += fail
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if _PARSE_POOL is not None:
+            _PARSE_POOL.shutdown()
+            _PARSE_POOL = None
+        if _HTTP_CACHE is not None:
+            _HTTP_CACHE.close()
+            _HTTP_CACHE = None
 
     print(f"\nDone! Total: {total_ok} ok, {total_fail} failed")
     return 0
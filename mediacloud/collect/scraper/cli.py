@@ -5,11 +5,16 @@ import sys
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import typer
 from tqdm import tqdm
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
 from .io_utils import get_url, load_records, read_urls_from_output, write_output
 from .scraper import DEFAULT_UA, scrape_url
 
@@ -116,27 +121,27 @@ def scrape(
 
     already = read_urls_from_output(output) if resume else set()
 
-    # Keep order stable, but skip already-seen
-    work: List[Dict[str, Any]] = []
+    # One pass: keep order stable, skip already-seen and repeated URLs, and
+    # turn records without a URL into error rows instead of pool tasks
+    out_records: List[Dict[str, Any]] = []
+    work: List[Tuple[Dict[str, Any], str]] = []
+    seen: Set[str] = set()
     for r in records:
         u = get_url(r)
         if not u:
-            work.append(r)
+            out_records.append({**r, "success": False, "error": "Missing url/link/uri", "method": method})
             continue
-        if u in already:
+        if u in already or u in seen:
             continue
-        work.append(r)
+        seen.add(u)
+        work.append((r, u))
 
-    if not work:
+    if not work and not out_records:
         typer.echo("Nothing to do.")
         return
 
-    out_records: List[Dict[str, Any]] = []
-
-    def do_one(rec: Dict[str, Any]) -> Dict[str, Any]:
-        u = get_url(rec)
-        if not u:
-            return {**rec, "success": False, "error": "Missing url/link/uri", "method": method}
+    def do_one(item: Tuple[Dict[str, Any], str]) -> Dict[str, Any]:
+        rec, u = item
 
         # For parallel runs, apply a small random staggering delay per task
         if workers > 1 and (delay_max > 0 or delay_min > 0):
@@ -153,24 +158,28 @@ def scrape(
         return {**rec, **res}
 
     if workers <= 1:
-        for idx, rec in enumerate(tqdm(work, desc="Scraping", unit="url")):
-            out_records.append(do_one(rec))
+        for idx, item in enumerate(tqdm(work, desc="Scraping", unit="url")):
+            out_records.append(do_one(item))
             if idx < len(work) - 1 and (delay_max > 0 or delay_min > 0):
                 time.sleep(random.uniform(delay_min, max(delay_min, delay_max)))
     else:
         with ThreadPoolExecutor(max_workers=int(workers)) as ex:
-            futures = [ex.submit(do_one, rec) for rec in work]
+            futures = [ex.submit(do_one, item) for item in work]
             for fut in tqdm(as_completed(futures), total=len(futures), desc="Scraping", unit="url"):
                 out_records.append(fut.result())
 
     # If resume and output exists, append to it (JSONL only). For JSON arrays, rewrite.
     if resume and output.exists() and output.suffix.lower() in {".jsonl", ".ndjson"}:
         output.parent.mkdir(parents=True, exist_ok=True)
-        with output.open("a", encoding="utf-8") as f:
-            import json
+        with output.open("ab") as f:
+            # One write() for the whole batch of new records
+            if orjson:
+                f.write(b"".join(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in out_records))
+            else:
+                import json
 
-            for r in out_records:
-                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+                # Compact separators match orjson, so appended bytes are the same either way
+                f.write("".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in out_records).encode("utf-8"))
         typer.echo(f"Appended {len(out_records)} records to {output}")
         return
 
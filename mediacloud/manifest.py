@@ -13,11 +13,20 @@ Manifest is stored as the first line of JSONL files (with "_manifest": true).
 
 from __future__ import annotations
 
+import bisect
 import json
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+# Per-line parser for the record scanners; orjson when installed, else stdlib
+json_loads = orjson.loads if orjson else json.loads
+
 
 def create_empty_manifest(topic: str, start_date: date) -> dict:
     """Create a new empty manifest for a topic."""
@@ -43,10 +52,10 @@ def parse_manifest(first_line: str) -> dict | None:
     Returns None if first line is not a manifest.
     """
     try:
-        obj = json.loads(first_line.strip())
+        obj = json_loads(first_line.strip())
         if isinstance(obj, dict) and obj.get("_manifest"):
             return obj
-    except (json.JSONDecodeError, TypeError):
+    except (ValueError, TypeError):
         pass
     return None
 
@@ -66,7 +75,8 @@ def load_manifest_from_jsonl(content: str) -> dict | None:
     if not content or not content.strip():
         return None
     
-    first_line = content.strip().split("\n")[0]
+    # Only the first line is needed; don't split the whole file
+    first_line = content.lstrip().split("\n", 1)[0]
     return parse_manifest(first_line)
 
 
@@ -83,29 +93,28 @@ def get_dates_to_collect(manifest: dict | None, topic_start_date: date) -> list[
     """
     today = date.today()
     
-    # Generate all dates from start to today
-    all_dates = set()
-    current = topic_start_date
-    while current <= today:
-        all_dates.add(current)
-        current = date(current.year, current.month, current.day + 1) if current.day < 28 else _next_date(current)
+    # dates_collected is stored sorted (ISO strings sort like dates), so walk it
+    # alongside the start..today range instead of building and diffing sets.
+    # sorted() is a linear pass over already-sorted input and guards hand edits.
+    collected = sorted(manifest.get("dates_collected", ())) if manifest else []
+    start_iso = topic_start_date.isoformat()
+    j = bisect.bisect_left(collected, start_iso)
     
-    # Subtract already collected dates
-    if manifest:
-        collected = set(date.fromisoformat(d) for d in manifest.get("dates_collected", []))
-    else:
-        collected = set()
-    
-    missing = sorted(all_dates - collected)
+    missing = []
+    d = topic_start_date
+    one_day = timedelta(days=1)
+    while d <= today:
+        iso = d.isoformat()
+        while j < len(collected) and collected[j] < iso:
+            j += 1
+        if j < len(collected) and collected[j] == iso:
+            j += 1
+        else:
+            missing.append(d)
+        d += one_day
     return missing
 
 
-def _next_date(d: date) -> date:
-    """Helper to get next date (handles month/year boundaries)."""
-    from datetime import timedelta
-    return d + timedelta(days=1)
-
-
 def detect_gaps(dates_collected: list[str], start_date: date, end_date: date) -> list[str]:
     """
     Detect gaps in collected dates.
@@ -115,16 +124,10 @@ def detect_gaps(dates_collected: list[str], start_date: date, end_date: date) ->
     if not dates_collected:
         return []
     
-    collected_set = set(dates_collected)
-    gaps = []
-    
-    current = start_date
-    while current <= end_date:
-        if current.isoformat() not in collected_set:
-            gaps.append(current.isoformat())
-        current = _next_date(current)
-    
-    return gaps
+    # ISO strings sort chronologically, so a set difference + sort gives the gaps in order
+    ndays = (end_date - start_date).days + 1
+    all_iso = {(start_date + timedelta(days=i)).isoformat() for i in range(ndays)}
+    return sorted(all_iso - set(dates_collected))
 
 
 def update_manifest_after_run(
@@ -152,17 +155,20 @@ def update_manifest_after_run(
     
     # Update dates_collected
     existing_dates = set(manifest.get("dates_collected", []))
-    for d in dates_added:
-        existing_dates.add(d.isoformat() if isinstance(d, date) else d)
+    # dates_added is homogeneous (all date objects or all ISO strings), so type-check once
+    if dates_added and isinstance(dates_added[0], date):
+        existing_dates.update(map(date.isoformat, dates_added))
+    else:
+        existing_dates.update(dates_added)
     manifest["dates_collected"] = sorted(existing_dates)
     
     # Update daily_runs
     daily_runs = manifest.get("daily_runs", {})
-    if today_str not in daily_runs:
-        daily_runs[today_str] = {"count": 0, "first": time_str, "last": time_str, "mode": mode}
-    
-    daily_runs[today_str]["count"] += 1
-    daily_runs[today_str]["last"] = time_str
+    today_run = daily_runs.setdefault(
+        today_str, {"count": 0, "first": time_str, "last": time_str, "mode": mode}
+    )
+    today_run["count"] += 1
+    today_run["last"] = time_str
     manifest["daily_runs"] = daily_runs
     
     # Update coverage
@@ -183,8 +189,8 @@ def update_manifest_after_run(
 
 
 def manifest_to_jsonl_line(manifest: dict) -> str:
-    """Convert manifest to a JSONL line."""
-    return json.dumps(manifest, ensure_ascii=False, sort_keys=False)
+    """Convert manifest to a JSONL line (compact, like the orjson-written records)."""
+    return json.dumps(manifest, ensure_ascii=False, separators=(",", ":"))
 
 
 def prepend_manifest_to_content(manifest: dict, content: str) -> str:
@@ -198,15 +204,22 @@ def prepend_manifest_to_content(manifest: dict, content: str) -> str:
     Returns:
         JSONL content with manifest as first line
     """
-    lines = content.strip().split("\n") if content.strip() else []
+    body = content.strip()
     
-    # Remove existing manifest if present
-    if lines and parse_manifest(lines[0]):
-        lines = lines[1:]
+    # Remove existing manifest if present (only the first line is inspected,
+    # the rest of the content is kept as one slice rather than split into lines)
+    first_line, _, rest = body.partition("\n")
+    if first_line and parse_manifest(first_line):
+        body = rest
     
     # Prepend new manifest
     manifest_line = manifest_to_jsonl_line(manifest)
-    return manifest_line + "\n" + "\n".join(lines) + ("\n" if lines else "")
+    return manifest_line + "\n" + body + ("\n" if body else "")
+
+
+def _is_header(obj: Any) -> bool:
+    """True for a manifest or _meta header record."""
+    return isinstance(obj, dict) and bool(obj.get("_manifest") or obj.get("_meta"))
 
 
 def load_records_skip_manifest(filepath: Path) -> list[dict]:
@@ -215,19 +228,22 @@ def load_records_skip_manifest(filepath: Path) -> list[dict]:
     if not filepath.exists():
         return records
     
-    with filepath.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                # Skip manifest and meta entries
-                if isinstance(obj, dict) and (obj.get("_manifest") or obj.get("_meta")):
-                    continue
-                records.append(obj)
-            except json.JSONDecodeError:
+    # One bulk read; json_loads takes the UTF-8 bytes directly, so no text decode
+    at_first_record = True
+    for line in filepath.read_bytes().splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json_loads(line)
+        except ValueError:
+            continue
+        # Manifest/meta header can only be the first record
+        if at_first_record:
+            at_first_record = False
+            if _is_header(obj):
                 continue
+        records.append(obj)
     
     return records
 
@@ -235,14 +251,20 @@ def load_records_skip_manifest(filepath: Path) -> list[dict]:
 def count_records_in_content(content: str) -> int:
     """Count non-manifest records in JSONL content."""
     count = 0
-    for line in content.strip().split("\n"):
+    at_first_record = True
+    for line in content.splitlines():
         line = line.strip()
         if not line:
             continue
         try:
-            obj = json.loads(line)
-            if isinstance(obj, dict) and not obj.get("_manifest") and not obj.get("_meta"):
-                count += 1
-        except json.JSONDecodeError:
+            obj = json_loads(line)
+        except ValueError:
             continue
+        # Manifest/meta header can only be the first record
+        if at_first_record:
+            at_first_record = False
+            if _is_header(obj):
+                continue
+        if isinstance(obj, dict):
+            count += 1
     return count
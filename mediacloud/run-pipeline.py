@@ -16,6 +16,7 @@ Usage:
     python3 run-pipeline.py --auto                   # no prompts (for cron/GitHub Actions)
     python3 run-pipeline.py --wait                   # wait for other mcloud processes
     python3 run-pipeline.py --at 03:00               # run at specific time
+    python3 run-pipeline.py --sequential             # don't scrape until fetch is done
 
 IMPORTANT: Automated workflows (GitHub Actions) should ALWAYS pass --topic explicitly.
 """
@@ -23,10 +24,18 @@ IMPORTANT: Automated workflows (GitHub Actions) should ALWAYS pass --topic expli
 from __future__ import annotations
 
 import argparse
+import codecs
+import fcntl
+import importlib.util
+import json
 import os
+import re
+import select
 import subprocess
 import sys
+import tempfile
 import time
+import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -43,9 +52,20 @@ CLEAN_SCRIPT = SCRIPT_DIR / "clean.py"
 
 BREAK_SECONDS = 0  # seconds between fetch and scrape
 
+# While fetch runs, scrape the URLs it has written so far this often (seconds)
+SCRAPE_PASS_SECONDS = 60
+
 # Track pipeline start time
 _pipeline_start: datetime | None = None
 
+# Held (flock) by the running pipeline, so --wait can tell when another run is done
+LOCK_FILE = Path(tempfile.gettempdir()) / "mina-pipeline.lock"
+_lock_file = None
+
+# Stand-alone MediaCloud scripts (started outside the pipeline) to wait for
+PEER_PATTERN = "python.*(mediacloud|mcloud|fetch-urls)"
+_PEER_RE = re.compile(PEER_PATTERN.encode())
+
 print("Let's goooooo!")
 
 
@@ -70,6 +90,65 @@ def push_to_gist(gist_id: str, filename: str, local_file: Path) -> int:
         return 1
 
 
+def _write_gist_payload(out, files: dict[str, Path]) -> None:
+    """Write the PATCH body {"files": {name: {"content": ...}}} to `out`.
+
+    Each file is JSON-escaped 1 MiB at a time, so it is never held in memory whole.
+    """
+    out.write(b'{"files": {')
+    for i, (name, path) in enumerate(files.items()):
+        if i:
+            out.write(b", ")
+        out.write(json.dumps(name).encode() + b': {"content": "')
+        # Incremental decoding keeps multi-byte characters split across chunks intact
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                out.write(json.dumps(decoder.decode(chunk))[1:-1].encode())
+        out.write(json.dumps(decoder.decode(b"", final=True))[1:-1].encode())
+        out.write(b'"}')
+    out.write(b"}}")
+
+
+def push_files_to_gist_api(gist_id: str, files: dict[str, Path]) -> bool:
+    """Update several gist files in one PATCH to the GitHub API.
+
+    Needs GITHUB_TOKEN / GIST_PAT / GH_TOKEN in the environment; returns False
+    (so the caller can fall back to gh) when there is none or the request fails.
+    """
+    token = os.getenv("GITHUB_TOKEN") or os.getenv("GIST_PAT") or os.getenv("GH_TOKEN")
+    if not token:
+        return False
+
+    import requests
+
+    names = ", ".join(files)
+    print(f"   Pushing {names} (one API request)...")
+    # The body is spooled to a temp file and streamed, not built as one big string
+    try:
+        with tempfile.TemporaryFile() as body:
+            _write_gist_payload(body, files)
+            body.seek(0)
+            resp = requests.patch(
+                f"https://api.github.com/gists/{gist_id}",
+                data=body,
+                headers={
+                    "Authorization": f"token {token}",
+                    "Accept": "application/vnd.github+json",
+                    "Content-Type": "application/json",
+                },
+                timeout=300,
+            )
+    except (OSError, requests.RequestException) as e:
+        print(f"   ✗ Failed: {e}")
+        return False
+    if resp.status_code != 200:
+        print(f"   ✗ Failed: HTTP {resp.status_code} {resp.text[:200]}")
+        return False
+    print(f"   ✓ {names} pushed successfully")
+    return True
+
+
 def elapsed_str() -> str:
     """Return human-readable elapsed time since pipeline started."""
     if _pipeline_start is None:
@@ -85,47 +164,150 @@ def elapsed_str() -> str:
     return f"{secs}s"
 
 
+def _hms() -> str:
+    """Current time as HH:MM:SS for progress lines (same as strftime("%H:%M:%S"))."""
+    now = datetime.now()
+    return f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
+
+
 def countdown(total_seconds: int, label: str = "Starting") -> None:
     """Countdown with minute-by-minute updates."""
-    remaining = total_seconds
-    while remaining > 0:
-        mins_left = remaining // 60
-        now_str = datetime.now().strftime("%H:%M:%S")
-        print(f"   [{now_str}] {label} in {mins_left} min...", flush=True)
-        sleep_time = min(60, remaining)
-        time.sleep(sleep_time)
-        remaining -= sleep_time
+    # Measured against a deadline so print/sleep overhead never accumulates
+    deadline = time.monotonic() + total_seconds
+    last_mins = None
+    while (remaining := deadline - time.monotonic()) > 0:
+        mins_left = int(remaining // 60)
+        if mins_left != last_mins:
+            print(f"   [{_hms()}] {label} in {mins_left} min...", flush=True)
+            last_mins = mins_left
+        # Up to a minute at a time, shrinking to 1s steps as the deadline nears
+        time.sleep(min(remaining, max(1, min(60, remaining / 4))))
     print(f"   Countdown complete!", flush=True)
 
 
-def other_mcloud_running() -> bool:
-    """Check if another mediacloud-related Python process is running."""
+def _acquire_lock(block: bool) -> bool:
+    """Take the pipeline lock (held until this process exits). False if busy and not blocking."""
+    global _lock_file
+    if _lock_file is None:
+        _lock_file = open(LOCK_FILE, "a")
     try:
-        my_pid = str(os.getpid())
-        result = subprocess.run(
-            ["pgrep", "-f", "python.*(mediacloud|mcloud|fetch-urls)"],
-            capture_output=True, text=True
-        )
-        pids = [p.strip() for p in result.stdout.strip().split("\n") if p.strip()]
-        other_pids = [p for p in pids if p != my_pid]
-        return len(other_pids) > 0
-    except Exception:
+        fcntl.flock(_lock_file, fcntl.LOCK_EX | (0 if block else fcntl.LOCK_NB))
+    except BlockingIOError:
         return False
+    # Record the holder so waiting runs can watch it exit
+    _lock_file.truncate(0)
+    _lock_file.write(str(os.getpid()))
+    _lock_file.flush()
+    return True
+
+
+def _lock_holder() -> int | None:
+    """PID written by the run holding the lock, if any."""
+    try:
+        return int(LOCK_FILE.read_text().strip() or 0) or None
+    except (OSError, ValueError):
+        return None
+
+
+def _wait_for_exit(pids: list[int], timeout: float) -> None:
+    """Sleep up to `timeout` seconds, returning early when any of `pids` exits.
+
+    Uses pidfds where available (Linux); otherwise just sleeps.
+    """
+    fds = []
+    if hasattr(os, "pidfd_open"):
+        for pid in pids:
+            try:
+                fds.append(os.pidfd_open(pid))
+            except OSError:  # already gone: no need to wait at all
+                timeout = 0
+    try:
+        if fds:
+            select.select(fds, [], [], timeout)
+        elif timeout > 0:
+            time.sleep(timeout)
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _wait_for_all_exit(pids: list[int]) -> None:
+    """Block until every one of `pids` has exited (needs os.pidfd_open)."""
+    poller = select.poll()
+    fds = set()
+    for pid in pids:
+        try:
+            fd = os.pidfd_open(pid)
+        except OSError:  # already gone
+            continue
+        poller.register(fd, select.POLLIN)
+        fds.add(fd)
+    try:
+        # A pidfd turns readable when its process exits; no timeout, no polling
+        while fds:
+            for fd, _ in poller.poll():
+                poller.unregister(fd)
+                os.close(fd)
+                fds.discard(fd)
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _scan_proc() -> list[int]:
+    """PIDs of other MediaCloud Python processes, matched like `pgrep -f PEER_PATTERN`.
 
+    Reads /proc/*/cmdline directly on Linux; elsewhere falls back to pgrep.
+    """
+    skip = {os.getpid(), os.getppid()}
+    if sys.platform != "linux":
+        try:
+            result = subprocess.run(["pgrep", "-f", PEER_PATTERN], capture_output=True, text=True)
+        except FileNotFoundError:
+            return []
+        return [int(p) for p in result.stdout.split() if int(p) not in skip]
+
+    pids = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit() or int(entry.name) in skip:
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                cmd = f.read().replace(b"\0", b" ")
+        except OSError:  # exited meanwhile, or not ours to read
+            continue
+        if _PEER_RE.search(cmd):
+            pids.append(int(entry.name))
+    return pids
+
+
+def other_mcloud_running() -> bool:
+    """Check if another pipeline run holds the lock (taking it when free) or
+    a stand-alone MediaCloud script is running."""
+    return not _acquire_lock(block=False) or bool(_scan_proc())
 
-def wait_for_clear() -> None:
-    """Wait until no other MediaCloud processes are running."""
-    check_interval = 5 * 60
 
+def wait_for_clear(check_interval: float = 5 * 60) -> None:
+    """Wait until no other pipeline run or MediaCloud script is running.
+
+    Stand-alone scripts found by the scan are waited on until they exit, then
+    re-scanned; without pidfds (non-Linux) the scan repeats every
+    `check_interval` seconds instead.
+    """
     if not other_mcloud_running():
         print("No other MediaCloud processes detected.")
         return
 
-    print("Waiting for other MediaCloud process(es) to finish...")
-    while other_mcloud_running():
-        now = datetime.now().strftime("%H:%M:%S")
-        print(f"   [{now}] Still running... checking again in {check_interval // 60} min", flush=True)
-        time.sleep(check_interval)
+    print("Waiting for other MediaCloud process(es) to finish...", flush=True)
+    # Blocks in the kernel until another pipeline run exits; no polling
+    _acquire_lock(block=True)
+    while peers := _scan_proc():
+        if hasattr(os, "pidfd_open"):
+            print(f"   [{_hms()}] Still running... waiting for PID(s) {', '.join(map(str, peers))} to exit", flush=True)
+            _wait_for_all_exit(peers)
+        else:
+            print(f"   [{_hms()}] Still running... checking again in {check_interval / 60:g} min", flush=True)
+            _wait_for_exit(peers, check_interval)
 
     print("Other process(es) finished!")
 
@@ -145,8 +327,53 @@ def wait_until_time(target: str) -> None:
     print("Time reached!")
 
 
-def run_step(name: str, script: Path, extra_args: list[str] | None = None) -> int:
-    """Run a pipeline step, returning the exit code."""
+# Step modules loaded so far; repeated runs (e.g. scrape passes) reuse them
+_step_modules: dict[Path, object] = {}
+
+
+def _load_step(script: Path):
+    """Import a step script as a module once (clean.py -> `clean`, scrape-articles.py -> `scrape_articles`)."""
+    mod = _step_modules.get(script)
+    if mod is None:
+        name = script.stem.replace("-", "_")
+        spec = importlib.util.spec_from_file_location(name, script)
+        mod = importlib.util.module_from_spec(spec)
+        # Registered so dataclasses and process pools can resolve it by name
+        sys.modules[name] = mod
+        spec.loader.exec_module(mod)
+        _step_modules[script] = mod
+    return mod
+
+
+def _run_in_process(script: Path, args: list[str]) -> int:
+    """Call a step script's main(args) in this interpreter, returning its exit code."""
+    saved_argv, saved_cwd = sys.argv, os.getcwd()
+    sys.argv = [str(script), *args]
+    os.chdir(script.parent)
+    try:
+        rc = _load_step(script).main(args)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+    return rc if isinstance(rc, int) else 0
+
+
+def run_step(
+    name: str, script: Path, extra_args: list[str] | None = None, subprocess_mode: bool = False
+) -> int:
+    """Run a pipeline step, returning the exit code.
+
+    Steps run in this process via their main(argv) (no interpreter start-up,
+    and each script is imported only once) unless subprocess_mode is set.
+    """
     step_start = datetime.now()
     print(f"\n{'='*60}")
     print(f"STEP: {name}")
@@ -159,11 +386,16 @@ def run_step(name: str, script: Path, extra_args: list[str] | None = None) -> in
         print(f"ERROR: Script not found: {script}", file=sys.stderr)
         return 1
 
-    cmd = [sys.executable, str(script)]
-    if extra_args:
-        cmd.extend(extra_args)
+    if subprocess_mode:
+        cmd = [sys.executable, str(script)]
+        if extra_args:
+            cmd.extend(extra_args)
 
-    result = subprocess.run(cmd, cwd=script.parent, env=os.environ.copy())
+        # stdout/stderr are inherited, so step output streams straight to our console
+        returncode = subprocess.run(cmd, cwd=script.parent, env=os.environ.copy()).returncode
+    else:
+        returncode = _run_in_process(script, extra_args or [])
+        sys.stdout.flush()
 
     step_elapsed = datetime.now() - step_start
     step_mins = int(step_elapsed.total_seconds() // 60)
@@ -171,7 +403,51 @@ def run_step(name: str, script: Path, extra_args: list[str] | None = None) -> in
     print(f"\n   Step '{name}' finished in {step_mins}m {step_secs}s")
     print(f"   Pipeline elapsed: {elapsed_str()}", flush=True)
 
-    return result.returncode
+    return returncode
+
+
+def run_fetch_overlapped(
+    topic: str, fetch_args: list[str], scrape_args: list[str], subprocess_mode: bool = False
+) -> int:
+    """Run the fetch step in a child process, scraping its output while it runs.
+
+    Fetch appends to raw/<topic>/<today>/urls.jsonl. Every SCRAPE_PASS_SECONDS
+    a scrape pass over that directory picks up the new URLs (resume skips the
+    ones already done), so the scrape step after fetch only has the tail left.
+    Returns the fetch exit code; failed passes are left to that final scrape.
+    """
+    step_start = datetime.now()
+    print(f"\n{'='*60}")
+    print("STEP: Fetch URLs from MediaCloud (scraping as they arrive)")
+    print(f"   Script: {FETCH_SCRIPT}")
+    print(f"   Started: {step_start.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"   Pipeline elapsed: {elapsed_str()}")
+    print("=" * 60, flush=True)
+
+    fetch = subprocess.Popen([sys.executable, str(FETCH_SCRIPT), *fetch_args], cwd=FETCH_SCRIPT.parent)
+    today = datetime.now().date().isoformat()
+    urls_file = SCRIPT_DIR / "raw" / topic / today / "urls.jsonl"
+    try:
+        while True:
+            try:
+                rc = fetch.wait(timeout=SCRAPE_PASS_SECONDS)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if urls_file.exists():
+                run_step("Scrape URLs fetched so far", SCRAPE_SCRIPT,
+                         [*scrape_args, "--date", today], subprocess_mode)
+    finally:
+        if fetch.poll() is None:
+            fetch.terminate()
+            fetch.wait()
+
+    step_elapsed = datetime.now() - step_start
+    step_mins = int(step_elapsed.total_seconds() // 60)
+    step_secs = int(step_elapsed.total_seconds() % 60)
+    print(f"\n   Fetch finished in {step_mins}m {step_secs}s")
+    print(f"   Pipeline elapsed: {elapsed_str()}", flush=True)
+    return rc
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -208,6 +484,10 @@ Examples:
                         help="Push results to gist after completion (requires gh CLI)")
     parser.add_argument("--auto", action="store_true",
                         help="No interactive prompts (for cron/GitHub Actions)")
+    parser.add_argument("--subprocess", action="store_true",
+                        help="Run each step in a separate Python process")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Don't scrape while fetching; run fetch to completion first")
     args = parser.parse_args(argv)
 
     if args.list_topics:
@@ -237,20 +517,33 @@ Examples:
         # Wait for whichever comes first
         print(f"\nWill start when: no other mcloud processes OR time reaches {args.at}")
         target_hour, target_minute = map(int, args.at.split(":"))
+        backoff = 5.0
         while True:
-            if not other_mcloud_running():
+            peers = _scan_proc()
+            if _acquire_lock(block=False) and not peers:
                 print("No other MediaCloud processes. Starting now!")
                 break
             now = datetime.now()
             if now.hour == target_hour and now.minute >= target_minute:
                 print(f"Time reached ({args.at}). Starting now!")
                 break
-            time.sleep(60)
+            target = now.replace(hour=target_hour, minute=target_minute, second=0, microsecond=0)
+            if target <= now:
+                target += timedelta(days=1)
+            holder = _lock_holder()
+            if holder is not None and holder != os.getpid():
+                peers.append(holder)
+            # Wake as soon as a peer exits; otherwise re-check with growing gaps
+            _wait_for_exit(peers, min(backoff, (target - now).total_seconds()))
+            backoff = min(backoff * 2, 15 * 60)
     elif args.wait:
         wait_for_clear()
     elif args.at:
         wait_until_time(args.at)
 
+    # Hold the lock while running (if free) so other runs' --wait waits on us
+    _acquire_lock(block=False)
+
     # Build args for fetch script (--days only applies to fetch)
     fetch_args = ["--topic", topic]
     if args.days:
@@ -261,7 +554,10 @@ Examples:
 
     # Step 1: Fetch URLs
     if not args.clean_only:
-        rc = run_step("Fetch URLs from MediaCloud", FETCH_SCRIPT, fetch_args)
+        if args.sequential:
+            rc = run_step("Fetch URLs from MediaCloud", FETCH_SCRIPT, fetch_args, args.subprocess)
+        else:
+            rc = run_fetch_overlapped(topic, fetch_args, topic_args, args.subprocess)
         if rc != 0:
             print(f"\nFetch failed with code {rc}", file=sys.stderr)
             return rc
@@ -272,7 +568,7 @@ Examples:
             time.sleep(BREAK_SECONDS)
 
         # Step 2: Scrape articles
-        rc = run_step("Scrape article metadata", SCRAPE_SCRIPT, topic_args)
+        rc = run_step("Scrape article metadata", SCRAPE_SCRIPT, topic_args, args.subprocess)
         if rc != 0:
             print(f"\nScraping failed with code {rc}", file=sys.stderr)
             return rc
@@ -281,7 +577,7 @@ Examples:
     if not args.collect_only:
         clean_args = topic_args.copy()
 
-        rc = run_step("Clean and filter data", CLEAN_SCRIPT, clean_args)
+        rc = run_step("Clean and filter data", CLEAN_SCRIPT, clean_args, args.subprocess)
         if rc != 0:
             print(f"\nCleaning failed with code {rc}", file=sys.stderr)
             return rc
@@ -295,19 +591,20 @@ Examples:
             print(f"Gist ID: {gist_id}")
             print("=" * 60)
             
-            # Push raw.jsonl
             raw_file = SCRIPT_DIR / "raw" / topic / "_combined.jsonl"
-            if raw_file.exists():
-                rc = push_to_gist(gist_id, "raw.jsonl", raw_file)
-                if rc != 0:
-                    print(f"Warning: Failed to push raw.jsonl (exit code {rc})")
-            
-            # Push clean.jsonl
             clean_file = SCRIPT_DIR / "clean" / f"articles-{topic}.jsonl"
-            if clean_file.exists():
-                rc = push_to_gist(gist_id, "clean.jsonl", clean_file)
-                if rc != 0:
-                    print(f"Warning: Failed to push clean.jsonl (exit code {rc})")
+            files = {
+                name: path
+                for name, path in (("raw.jsonl", raw_file), ("clean.jsonl", clean_file))
+                if path.exists()
+            }
+
+            # Both files in one API call when a token is available; else gh per file
+            if files and not push_files_to_gist_api(gist_id, files):
+                for name, path in files.items():
+                    rc = push_to_gist(gist_id, name, path)
+                    if rc != 0:
+                        print(f"Warning: Failed to push {name} (exit code {rc})")
         else:
             print(f"\nWarning: No gist_id configured for topic '{topic}', skipping push")
 
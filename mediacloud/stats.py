@@ -7,21 +7,37 @@ Usage:
     python stats.py --topic minneapolis-ice  # analyze specific topic from gist
     python stats.py --local                  # use local clean/ files instead
     python stats.py --raw                    # analyze raw data (before filtering)
+    python stats.py --charts-only            # write charts only, no text report
 """
 
 import argparse
+import hashlib
+import heapq
 import json
 import os
+import re
 import sys
+import threading
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 
+import matplotlib
+matplotlib.use('Agg')  # charts are only written to files
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import numpy as np
 import requests
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+json_loads = orjson.loads if orjson else json.loads
+
 # Add parent directory to path to import config
 SCRIPT_DIR = Path(__file__).parent.resolve()
 sys.path.insert(0, str(SCRIPT_DIR))
@@ -30,6 +46,9 @@ from config import TOPICS, get_topic_config
 CLEAN_DIR = SCRIPT_DIR / "clean"
 OUTPUT_DIR = SCRIPT_DIR / "stats-output"
 
+# Topics downloaded at once; the analysis itself still runs one topic at a time
+MAX_LOAD_WORKERS = 8
+
 
 def setup_publication_style():
     """Configure matplotlib for publication-quality charts (538/Economist style)."""
@@ -67,6 +86,14 @@ def setup_publication_style():
     })
 
 
+# Tick label format for the stories-per-date panel
+DATE_TICK_FORMAT = '%b %d'
+
+
+# Leading www. and trailing TLD, trimmed from outlet names in chart labels
+_OUTLET_STRIP_RE = re.compile(r'^www\.|\.(?:com|org|net|co\.uk)$')
+
+
 # Color palette inspired by quality publications
 COLORS = {
     'primary': '#E6553A',      # Economist red-orange
@@ -78,19 +105,88 @@ COLORS = {
 }
 
 
+# One keep-alive pool for every gist request (API and raw files), shared by the
+# topic loader threads so each host's TLS handshake happens once per run
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': 'mina-pipeline'})
+
+
+# Gist downloads, cached in the same layout as gists/gist-overview.py (API
+# response + ETag/Last-Modified validators, raw files keyed by raw_url), so a
+# download made by either script is revalidated or reused by the other
+CACHE_DIR = Path.home() / '.cache' / 'mina-gists'
+
+
+def cache_path(url: str, suffix: str) -> Path:
+    """Cache file for a URL."""
+    return CACHE_DIR / (hashlib.sha1(url.encode()).hexdigest() + suffix)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _fetch_gist_meta(gist_id: str, headers: dict) -> dict | None:
+    """GET the gist's API JSON, answering from the cached copy on 304."""
+    url = f'https://api.github.com/gists/{gist_id}'
+    cached_body = cache_path(url, '.json')
+    cached_validators = cache_path(url, '.validators.json')
+
+    # Revalidate the cached response; GitHub answers 304 with no body if unchanged
+    req_headers = {**headers, 'Accept': 'application/vnd.github+json'}
+    if cached_body.exists() and cached_validators.exists():
+        validators = json_loads(cached_validators.read_bytes())
+        if validators.get('etag'):
+            req_headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            req_headers['If-Modified-Since'] = validators['last_modified']
+
+    response = SESSION.get(url, headers=req_headers, timeout=30)
+
+    if response.status_code == 304:
+        return json_loads(cached_body.read_bytes())
+    if response.status_code != 200:
+        print(f"Error fetching gist {gist_id}: {response.status_code}")
+        return None
+
+    validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    if any(validators.values()):
+        _write_atomic(cached_body, response.content)
+        _write_atomic(cached_validators, json.dumps(validators).encode())
+    return json_loads(response.content)
+
+
+def _fetch_raw_file(filename: str, raw_url: str, headers: dict) -> Path | None:
+    """Download a truncated file from raw_url to the cache and return its path."""
+    # raw_url embeds the file revision, so a cached copy never goes stale
+    cached = cache_path(raw_url, '.jsonl')
+    if cached.exists():
+        return cached
+
+    raw_response = SESSION.get(raw_url, headers=headers, timeout=30)
+    if raw_response.status_code != 200:
+        print(f"Error fetching raw content for {filename}: {raw_response.status_code}")
+        return None
+    # Stored as received; load_stories_from_file parses the bytes directly
+    _write_atomic(cached, raw_response.content)
+    return cached
+
+
 def get_gist_content(gist_id: str, filename: str) -> list[dict]:
     """Fetch and parse a JSONL file from a gist (handles truncation)."""
     token = os.getenv('GITHUB_TOKEN') or os.getenv('GIST_PAT')
     headers = {'Authorization': f'token {token}'} if token else {}
 
-    url = f'https://api.github.com/gists/{gist_id}'
-    response = requests.get(url, headers=headers)
-
-    if response.status_code != 200:
-        print(f"Error fetching gist {gist_id}: {response.status_code}")
+    gist_data = _fetch_gist_meta(gist_id, headers)
+    if gist_data is None:
         return []
 
-    gist_data = response.json()
     if filename not in gist_data['files']:
         print(f"File {filename} not found in gist {gist_id}")
         return []
@@ -101,45 +197,42 @@ def get_gist_content(gist_id: str, filename: str) -> list[dict]:
     if file_info.get('truncated', False):
         raw_url = file_info.get('raw_url')
         if raw_url:
-            raw_response = requests.get(raw_url, headers=headers)
-            if raw_response.status_code == 200:
-                content = raw_response.text
-            else:
-                print(f"Error fetching raw content for {filename}: {raw_response.status_code}")
+            content_path = _fetch_raw_file(filename, raw_url, headers)
+            if content_path is None:
                 return []
-        else:
-            print(f"File {filename} is truncated but no raw_url available")
-            return []
-    else:
-        content = file_info['content']
+            # Parsed straight from the cached copy, without a str round-trip
+            return load_stories_from_file(content_path)
+        print(f"File {filename} is truncated but no raw_url available")
+        return []
 
     entries = []
-    for line in content.split('\n'):
-        line = line.strip()
-        if line:
-            try:
-                entry = json.loads(line)
-                if not entry.get('_meta'):  # Skip meta headers
-                    entries.append(entry)
-            except json.JSONDecodeError:
-                continue
+    # Encoded once so the inline content takes the same bytes path as files
+    for line in file_info['content'].encode('utf-8').splitlines():
+        if not line or line.isspace():
+            continue
+        try:
+            entry = json_loads(line)
+            if not entry.get('_meta'):  # Skip meta headers
+                entries.append(entry)
+        except ValueError:  # json.JSONDecodeError / orjson.JSONDecodeError
+            continue
     return entries
 
 
 def load_stories_from_file(jsonl_path: Path) -> list[dict]:
     """Load all stories from a single JSONL file."""
     stories = []
-    with open(jsonl_path, "r", encoding="utf-8") as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-                if not entry.get('_meta'):  # Skip meta headers
-                    stories.append(entry)
-            except json.JSONDecodeError as e:
-                print(f"Warning: Failed to parse {jsonl_path.name} line {line_num}: {e}")
+    # One read and a bytes split; orjson (when installed) parses bytes directly
+    # JSON parsers skip surrounding whitespace themselves, so lines aren't stripped
+    for line_num, line in enumerate(jsonl_path.read_bytes().splitlines(), 1):
+        if not line or line.isspace():
+            continue
+        try:
+            entry = json_loads(line)
+            if not entry.get('_meta'):  # Skip meta headers
+                stories.append(entry)
+        except ValueError as e:  # json.JSONDecodeError / orjson.JSONDecodeError
+            print(f"Warning: Failed to parse {jsonl_path.name} line {line_num}: {e}")
     return stories
 
 
@@ -159,10 +252,8 @@ def load_stories_gist(topic: str, use_raw: bool = False) -> list[dict]:
     return get_gist_content(gist_id, filename)
 
 
-def create_stories_per_date_chart(dates_counter: Counter, output_path: Path, topic: str) -> None:
-    """Create a time-series bar chart of stories per date."""
-    setup_publication_style()
-
+def _draw_dates_panel(ax, dates_counter: Counter, topic: str) -> bool:
+    """Paint the stories-per-date bar chart onto ax. Returns False if there is nothing to plot."""
     # Sort dates and filter out 'unknown'
     sorted_items = sorted(
         [(d, c) for d, c in dates_counter.items() if d != 'unknown'],
@@ -171,58 +262,45 @@ def create_stories_per_date_chart(dates_counter: Counter, output_path: Path, top
 
     if not sorted_items:
         print("  No valid dates to visualize.")
-        return
+        return False
 
     dates = [datetime.strptime(d, '%Y-%m-%d') for d, _ in sorted_items]
     counts = [c for _, c in sorted_items]
 
-    fig, ax = plt.subplots(figsize=(12, 5))
-
     # Create bars with uniform color
-    bars = ax.bar(dates, counts, width=0.8, color=COLORS['secondary'], edgecolor='none')
+    ax.bar(dates, counts, width=0.8, color=COLORS['secondary'], edgecolor='none')
 
     # Formatting
     ax.set_xlabel('')
     ax.set_ylabel('Number of Stories', color=COLORS['dark'])
     ax.set_title(f'Stories per date — {topic}', loc='left', pad=15, color=COLORS['dark'])
 
-    # Format x-axis dates
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
+    # Format x-axis dates (formatters bind to one axis, so each panel gets its own)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter(DATE_TICK_FORMAT))
     ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(dates) // 10)))
-    plt.xticks(rotation=45, ha='right')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
 
     # Clean up spines
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
     ax.spines['left'].set_visible(False)
     ax.spines['bottom'].set_color('#cccccc')
-
-    plt.tight_layout()
-    plt.subplots_adjust(top=0.92, bottom=0.18)
-
-    chart_path = output_path / f'stories_per_date_{topic}.png'
-    plt.savefig(chart_path, facecolor='white')
-    plt.close()
-    print(f"  Saved: {chart_path}")
+    return True
 
 
-def create_stories_per_outlet_chart(outlets_counter: Counter, output_path: Path, topic: str, top_n: int = 15) -> None:
-    """Create a horizontal bar chart of stories per outlet."""
-    setup_publication_style()
-
+def _draw_outlets_panel(ax, outlets_counter: Counter, topic: str, top_n: int = 15) -> bool:
+    """Paint the stories-per-outlet horizontal bar chart onto ax. Returns False if there is nothing to plot."""
     # Get top outlets
     top_outlets = outlets_counter.most_common(top_n)
 
     if not top_outlets:
         print("  No outlets to visualize.")
-        return
+        return False
 
     # Reverse for horizontal bar chart (top item at top)
     outlets = [o for o, _ in reversed(top_outlets)]
     counts = [c for _, c in reversed(top_outlets)]
 
-    fig, ax = plt.subplots(figsize=(10, max(6, len(outlets) * 0.4)))
-
     max_count = max(counts)
 
     # Create horizontal bars with uniform color
@@ -240,8 +318,7 @@ def create_stories_per_outlet_chart(outlets_counter: Counter, output_path: Path,
     # Clean up outlet names for display
     clean_outlets = []
     for outlet in outlets:
-        name = outlet.replace('www.', '').replace('.com', '').replace('.org', '')
-        name = name.replace('.co.uk', '').replace('.net', '')
+        name = _OUTLET_STRIP_RE.sub('', outlet)
         if len(name) > 25:
             name = name[:22] + '...'
         clean_outlets.append(name)
@@ -263,14 +340,45 @@ def create_stories_per_outlet_chart(outlets_counter: Counter, output_path: Path,
     # Only horizontal grid
     ax.xaxis.grid(True)
     ax.yaxis.grid(False)
-
-    plt.tight_layout()
-    plt.subplots_adjust(top=0.92, bottom=0.08)
-
-    chart_path = output_path / f'stories_per_outlet_{topic}.png'
-    plt.savefig(chart_path, facecolor='white')
-    plt.close()
-    print(f"  Saved: {chart_path}")
+    return True
+
+
+def create_topic_dashboard(dates_counter: Counter, outlets_counter: Counter, output_path: Path, topic: str) -> None:
+    """Render stories-per-date and stories-per-outlet as two panels of one PNG."""
+    fig, (ax_top, ax_bot) = plt.subplots(2, 1, figsize=(12, 11), gridspec_kw={'height_ratios': [1, 1.5]})
+    try:
+        has_dates = _draw_dates_panel(ax_top, dates_counter, topic)
+        has_outlets = _draw_outlets_panel(ax_bot, outlets_counter, topic)
+        if not (has_dates or has_outlets):
+            return
+        if not has_dates:
+            ax_top.set_visible(False)
+        if not has_outlets:
+            ax_bot.set_visible(False)
+
+        fig.tight_layout(h_pad=3)
+
+        chart_path = output_path / f'stats_{topic}.png'
+        fig.savefig(chart_path, facecolor='white')
+        print(f"  Saved: {chart_path}")
+    finally:
+        plt.close(fig)
+
+
+def compute_counters(stories: list[dict]) -> tuple[Counter, Counter]:
+    """Stories per publish_date and per media_url (absent fields count as 'unknown')."""
+    dates = Counter()
+    outlets = Counter()
+    for story in stories:
+        dates[story.get("publish_date", "unknown")] += 1
+        outlets[story.get("media_url", "unknown")] += 1
+    return dates, outlets
+
+
+def render_charts(dates: Counter, outlets: Counter, topic: str) -> None:
+    """Write the topic's chart PNG to OUTPUT_DIR."""
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    create_topic_dashboard(dates, outlets, OUTPUT_DIR, topic)
 
 
 def describe_data(stories: list[dict], topic: str, source_label: str) -> None:
@@ -288,8 +396,15 @@ def describe_data(stories: list[dict], topic: str, source_label: str) -> None:
     print(f"Total stories: {len(stories):,}")
     print()
 
+    dates, outlets = compute_counters(stories)
+
+    # Pull each field into a column once; len/count then run over plain lists
+    url_col = [story.get("url", "") for story in stories]
+    # Lengths go straight into int arrays; mean/min/max/zero-count then run in C
+    desc_lengths = np.fromiter((len(story.get("description", "") or "") for story in stories), np.int64, len(stories))
+    title_lengths = np.fromiter((len(story.get("title", "") or "") for story in stories), np.int64, len(stories))
+
     # Stories per outlet
-    outlets = Counter(story.get("media_url", "unknown") for story in stories)
     print(f"Number of unique outlets: {len(outlets)}")
     print("\nStories per outlet (top 20):")
     print("-" * 40)
@@ -300,7 +415,6 @@ def describe_data(stories: list[dict], topic: str, source_label: str) -> None:
     print()
 
     # Stories per date
-    dates = Counter(story.get("publish_date", "unknown") for story in stories)
     sorted_dates = sorted(dates.items(), key=lambda x: x[0] if x[0] != "unknown" else "0000-00-00")
 
     valid_dates = [d for d, _ in sorted_dates if d != "unknown"]
@@ -314,28 +428,34 @@ def describe_data(stories: list[dict], topic: str, source_label: str) -> None:
     print()
 
     # Content statistics
-    descriptions = [story.get("description", "") or "" for story in stories]
-    titles = [story.get("title", "") or "" for story in stories]
-
-    desc_lengths = [len(d) for d in descriptions]
-    title_lengths = [len(t) for t in titles]
-
     print("Content statistics:")
     print("-" * 40)
-    if desc_lengths:
-        print(f"  Average description length: {sum(desc_lengths) / len(desc_lengths):,.0f} chars")
-        print(f"  Min description length:     {min(desc_lengths):,} chars")
-        print(f"  Max description length:     {max(desc_lengths):,} chars")
-    if title_lengths:
-        print(f"  Average title length:       {sum(title_lengths) / len(title_lengths):,.0f} chars")
+    if desc_lengths.size:
+        print(f"  Average description length: {desc_lengths.mean():,.0f} chars")
+        print(f"  Min description length:     {int(desc_lengths.min()):,} chars")
+        print(f"  Max description length:     {int(desc_lengths.max()):,} chars")
+    if title_lengths.size:
+        print(f"  Average title length:       {title_lengths.mean():,.0f} chars")
     print()
 
+    # Only repeated URLs get a count; the rest just go into a set
+    seen_urls = set()
+    duplicates = {}
+    missing_url = 0
+    for url in url_col:
+        if not url:
+            missing_url += 1
+        elif url in seen_urls:
+            duplicates[url] = duplicates.get(url, 1) + 1
+        else:
+            seen_urls.add(url)
+
     # Missing data check
-    missing_desc = sum(1 for d in descriptions if not d)
-    missing_title = sum(1 for t in titles if not t)
-    missing_url = sum(1 for s in stories if not s.get("url"))
-    missing_date = sum(1 for s in stories if not s.get("publish_date"))
-    missing_outlet = sum(1 for s in stories if not s.get("media_url"))
+    # Absent fields were counted under "unknown", which no writer stores as a value
+    missing_desc = int(np.count_nonzero(desc_lengths == 0))
+    missing_title = int(np.count_nonzero(title_lengths == 0))
+    missing_date = dates["unknown"] + sum(c for d, c in dates.items() if not d)
+    missing_outlet = outlets["unknown"] + sum(c for o, c in outlets.items() if not o)
 
     print("Data completeness:")
     print("-" * 40)
@@ -347,14 +467,11 @@ def describe_data(stories: list[dict], topic: str, source_label: str) -> None:
     print()
 
     # Duplicate check
-    urls = [story.get("url", "") for story in stories]
-    url_counts = Counter(urls)
-    duplicates = {url: count for url, count in url_counts.items() if count > 1 and url}
-
     if duplicates:
         print(f"Duplicate URLs found: {len(duplicates)}")
         print("  Top duplicates:")
-        for url, count in sorted(duplicates.items(), key=lambda x: -x[1])[:5]:
+        # Top 5 via a bounded heap; ties are listed in the order they were first repeated
+        for url, count in heapq.nlargest(5, duplicates.items(), key=itemgetter(1)):
             print(f"    {count}x: {url[:60]}...")
     else:
         print("No duplicate URLs found.")
@@ -372,9 +489,7 @@ def describe_data(stories: list[dict], topic: str, source_label: str) -> None:
     print("\n" + "=" * 60)
     print("Generating visualizations...")
     print("-" * 40)
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    create_stories_per_date_chart(dates, OUTPUT_DIR, topic)
-    create_stories_per_outlet_chart(outlets, OUTPUT_DIR, topic)
+    render_charts(dates, outlets, topic)
     print("\nDone! Charts saved to:", OUTPUT_DIR)
 
 
@@ -383,20 +498,33 @@ def main():
     parser.add_argument("--topic", type=str, help="Topic to analyze (default: all topics)")
     parser.add_argument("--local", action="store_true", help="Use local files instead of gists")
     parser.add_argument("--raw", action="store_true", help="Analyze raw data (before filtering)")
+    parser.add_argument("--charts-only", action="store_true", help="Only write the chart PNGs (skip the text report)")
     args = parser.parse_args()
 
     topics_to_analyze = [args.topic] if args.topic else list(TOPICS.keys())
 
-    for topic in topics_to_analyze:
-        if args.local:
-            source_label = f"local clean/articles-{topic}.jsonl"
-            stories = load_stories_local(topic)
-        else:
-            file_type = "raw" if args.raw else "clean"
-            source_label = f"gist {file_type}.jsonl"
-            stories = load_stories_gist(topic, use_raw=args.raw)
+    # rcParams and the font fallback chain only need resolving once per run
+    setup_publication_style()
 
-        describe_data(stories, topic, source_label)
+    if args.local:
+        source_label = "local clean/articles-{topic}.jsonl"
+        load = load_stories_local
+    else:
+        file_type = "raw" if args.raw else "clean"
+        source_label = f"gist {file_type}.jsonl"
+        load = lambda topic: load_stories_gist(topic, use_raw=args.raw)
+
+    # Downloads overlap; reports and charts are produced in topic order so
+    # output blocks never interleave (pyplot is not thread-safe either)
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(topics_to_analyze))) as pool:
+        for topic, stories in zip(topics_to_analyze, pool.map(load, topics_to_analyze)):
+            if not args.charts_only:
+                describe_data(stories, topic, source_label.format(topic=topic))
+            elif stories:
+                print(f"{topic}: {len(stories):,} stories")
+                render_charts(*compute_counters(stories), topic)
+            else:
+                print(f"{topic}: no stories found.")
 
 
 if __name__ == "__main__":
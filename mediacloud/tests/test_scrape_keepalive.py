@@ -0,0 +1,137 @@
+"""Connection reuse in scrape-articles.py's fetch_html.
+
+Run with: python -m unittest discover mediacloud/tests
+"""
+
+import importlib.util
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+MEDIACLOUD_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MEDIACLOUD_DIR))
+
+_spec = importlib.util.spec_from_file_location(
+    "scrape_articles", MEDIACLOUD_DIR / "collect" / "scrape-articles.py"
+)
+sa = importlib.util.module_from_spec(_spec)
+sys.modules["scrape_articles"] = sa
+_spec.loader.exec_module(sa)
+
+HEAD = b"<html><head><title>T</title><meta name='description' content='D'></head><body>"
+
+
+def _page(body_bytes: int) -> bytes:
+    return HEAD + b"x" * body_bytes + b"</body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    pages = {"/small": _page(100_000), "/large": _page(4 * sa.DRAIN_MAX_BYTES)}
+    # Served chunked, with no Content-Length
+    unsized = {"/unsized-small": _page(1_000), "/unsized-large": _page(sa.DRAIN_MAX_BYTES)}
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass  # client dropped the connection instead of reusing it
+
+    def do_GET(self):
+        if self.path in self.unsized:
+            self._send_chunked(self.unsized[self.path])
+            return
+        body = self.pages[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client hung up after reading <head>
+
+    def _send_chunked(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i in range(0, len(body), 16 * 1024):
+                piece = body[i:i + 16 * 1024]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchKeepAliveTest(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.connections = 0
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        self.cfg = sa.FetchConfig(timeout=5, retries=1, backoff_max=1, user_agent="test")
+        sa._tls.__dict__.clear()  # fresh per-thread Session
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch(self, path: str) -> str:
+        html, _, status, _ = sa.fetch_html(self.base + path, cfg=self.cfg)
+        self.assertEqual(status, 200)
+        return html
+
+    def fetch_many(self, path: str, times: int) -> None:
+        for _ in range(times):
+            self.assertIn("<title>T</title>", self.fetch(path))
+
+    def test_small_pages_reuse_one_connection(self):
+        for _ in range(5):
+            self.assertIn("<title>T</title>", self.fetch("/small"))
+        self.assertEqual(self.server.connections, 1)
+
+    def test_large_pages_are_not_drained(self):
+        for _ in range(3):
+            html = self.fetch("/large")
+            self.assertIn("<title>T</title>", html)
+            self.assertLess(len(html), len(_Handler.pages["/large"]))
+        self.assertEqual(self.server.connections, 3)
+
+    def test_short_unsized_pages_reuse_one_connection(self):
+        self.fetch_many("/unsized-small", 5)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_long_unsized_pages_read_one_chunk_at_most(self):
+        read = []
+        iter_content = sa.requests.Response.iter_content
+
+        def counting(resp, *args, **kwargs):
+            for chunk in iter_content(resp, *args, **kwargs):
+                read.append(len(chunk))
+                yield chunk
+
+        sa.requests.Response.iter_content = counting
+        try:
+            self.fetch_many("/unsized-large", 3)
+        finally:
+            sa.requests.Response.iter_content = iter_content
+        self.assertEqual(self.server.connections, 3)
+        # _read_head's first chunk plus one drained chunk per fetch
+        self.assertLessEqual(sum(read), 3 * 2 * sa.HTML_CHUNK_BYTES)
+
+
+if __name__ == "__main__":
+    unittest.main()